@@ -1,15 +1,25 @@
 import streamlit as st
 import fitz # PyMuPDF
 import pandas as pd
-from typing import List, Tuple, Dict, Any, Optional
+import pyarrow as pa
+from typing import List, Tuple, Dict, Any, Optional, Mapping, Union
 from io import BytesIO
 import logging
-import time
+import hashlib
 import re # Import regex for sanitizing sheet names
 import os # Import os to check for sample file existence
-
-# Import using wildcard as requested
-from scraping_functions import *
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from types import MappingProxyType
+
+from scraping_functions import (
+    get_informe_cev_v2_as_dataframes,
+    run_extractors_on_pdf_bytes,
+    make_extraction_pool,
+    PAGE_EXTRACTOR_GROUPS,
+    REPORT_HEIGHT,
+)
 
 # Configure logging for the app
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -21,34 +31,80 @@ SAMPLE_PDF_CAL_NAME = "10_192_2_b5ffa84b-d3b4-51c6-afa0-bc3eff628bfa.pdf"
 SAMPLE_PDF_PRECAL_PATH = os.path.join(REPORT_EXAMPLES_FOLDER, SAMPLE_PDF_PRECAL_NAME)
 SAMPLE_PDF_CAL_PATH = os.path.join(REPORT_EXAMPLES_FOLDER, SAMPLE_PDF_CAL_NAME)
 
+# Base sheet name of each extracted table, in the order of extracted_dfs (scraping_functions.PAGE_EXTRACTORS)
+PAGE_BASE_NAMES = (
+    "Página 1", "Página 2", "Página 3 - Consumos", "Página 3 - Envolvente",
+    "Página 4", "Página 5", "Página 6", "Página 7",
+)
+
 # --- Renaming Dictionaries ---
-RENAME_MAP_P1 = { "tipo_evaluacion": "Tipo de Evaluación", "codigo_evaluacion": "Código de Evaluación", "region": "Región", "comuna": "Comuna", "direccion": "Dirección", "rol_vivienda_proyecto": "Rol de Vivienda o Proyecto", "tipo_vivienda": "Tipo de Vivienda", "superficie_interior_util_m2": "Superficie Interior Útil (m²)", "porcentaje_ahorro": "Porcentaje de Ahorro (%)", "letra_eficiencia_energetica_dem": "Letra de Eficiencia Energética", "demanda_calefaccion_kwh_m2_ano": "Demanda Calefacción (kWh/m²/año)", "demanda_enfriamiento_kwh_m2_ano": "Demanda Enfriamiento (kWh/m²/año)", "demanda_total_kwh_m2_ano": "Demanda Total (kWh/m²/año)", "emitida_el": "Emitida el" }
-RENAME_MAP_P2 = { 'region': 'Región', 'comuna': 'Comuna', 'direccion': 'Dirección', 'rol_vivienda': 'Rol Vivienda', 'tipo_vivienda': 'Tipo Vivienda', 'zona_termica': 'Zona Térmica', 'superficie_interior_util_m2': 'Superficie Interior Útil (m²)', 'solicitado_por': 'Solicitado Por', 'evaluado_por': 'Evaluado Por', 'codigo_evaluacion': 'Código Evaluación', 'demanda_calefaccion_kwh_m2_ano': 'Demanda Calefacción Promedio (kWh/m²/año)', 'demanda_enfriamiento_kwh_m2_ano': 'Demanda Enfriamiento Promedio (kWh/m²/año)', 'demanda_total_kwh_m2_ano': 'Demanda Total Promedio (kWh/m²/año)', 'demanda_total_bis_kwh_m2_ano': 'Demanda Total Vivienda Eval. (kWh/m²/año)', 'demanda_total_referencia_kwh_m2_ano': 'Demanda Total Referencia (kWh/m²/año)', 'porcentaje_ahorro': 'Porcentaje Ahorro (%)', 'muro_principal_descripcion': 'Muro Principal: Descripción', 'muro_principal_exigencia_W_m2_K': 'Muro Principal: Exigencia (W/m²K)', 'muro_secundario_descripcion': 'Muro Secundario: Descripción', 'muro_secundario_exigencia_W_m2_K': 'Muro Secundario: Exigencia (W/m²K)', 'piso_principal_descripcion': 'Piso Principal: Descripción', 'piso_principal_exigencia_W_m2_K': 'Piso Principal: Exigencia (W/m²K)', 'puerta_principal_descripcion': 'Puerta Principal: Descripción', 'puerta_principal_exigencia': 'Puerta Principal: Exigencia', 'techo_principal_descripcion': 'Techo Principal: Descripción', 'techo_principal_exigencia_W_m2_K': 'Techo Principal: Exigencia (W/m²K)', 'techo_secundario_descripcion': 'Techo Secundario: Descripción', 'techo_secundario_exigencia_W_m2_K': 'Techo Secundario: Exigencia (W/m²K)', 'superficie_vidriada_principal_descripcion': 'Sup. Vidriada Principal: Descripción', 'superficie_vidriada_principal_exigencia': 'Sup. Vidriada Principal: Exigencia', 'superficie_vidriada_secundaria_descripcion': 'Sup. Vidriada Secundaria: Descripción', 'superficie_vidriada_secundaria_exigencia': 'Sup. Vidriada Secundaria: Exigencia', 'ventilacion_rah_descripcion': 'Ventilación (RAH): Descripción', 'ventilacion_rah_exigencia': 'Ventilación (RAH): Exigencia', 'infiltraciones_rah_descripcion': 'Infiltraciones (RAH): Descripción', 'infiltraciones_rah_exigencia': 'Infiltraciones (RAH): Exigencia' }
-RENAME_MAP_P3_CONSUMOS = { 'codigo_evaluacion': 'Código Evaluación', 'agua_caliente_sanitaria_kwh_m2': 'ACS (kWh/m²)', 'agua_caliente_sanitaria_perc': 'ACS (%)', 'iluminacion_kwh_m2': 'Iluminación (kWh/m²)', 'iluminacion_per': 'Iluminación (%)', 'calefaccion_kwh_m2': 'Calefacción (kWh/m²)', 'calefaccion_kwh_per': 'Calefacción (%)', 'energia_renovable_no_convencional_kwh_m2': 'ERNC (kWh/m²)', 'energia_renovable_no_convencional_per': 'ERNC (%)', 'consumo_total_kwh_m2': 'Consumo Total (kWh/m²)', 'emisiones_kgco2_m2_ano': 'Emisiones (kgCO₂e/m²/año)', 'calefaccion_descripcion_proy': 'Calefacción Proy.: Desc.', 'calefaccion_consumo_proy_kwh': 'Calefacción Proy. (kWh)', 'calefaccion_consumo_proy_per': 'Calefacción Proy. (%)', 'iluminacion_descripcion_proy': 'Iluminación Proy.: Desc.', 'iluminacion_consumo_proy_kwh': 'Iluminación Proy. (kWh)', 'iluminacion_consumo_proy_per': 'Iluminación Proy. (%)', 'agua_caliente_sanitaria_descripcion_proy': 'ACS Proy.: Desc.', 'agua_caliente_sanitaria_consumo_proy_kwh': 'ACS Proy. (kWh)', 'agua_caliente_sanitaria_consumo_proy_per': 'ACS Proy. (%)', 'energia_renovable_no_convencional_descripcion_proy': 'ERNC Proy.: Desc.', 'energia_renovable_no_convencional_consumo_proy_kwh': 'ERNC Proy. (kWh)', 'energia_renovable_no_convencional_consumo_proy_per': 'ERNC Proy. (%)', 'consumo_total_requerido_proy_kwh': 'Consumo Total Proy. (kWh)', 'calefaccion_descripcion_ref': 'Calefacción Ref.: Desc.', 'calefaccion_consumo_ref_kwh': 'Calefacción Ref. (kWh)', 'calefaccion_consumo_ref_per': 'Calefacción Ref. (%)', 'iluminacion_descripcion_ref': 'Iluminación Ref.: Desc.', 'iluminacion_consumo_ref_kwh': 'Iluminación Ref. (kWh)', 'iluminacion_consumo_ref_per': 'Iluminación Ref. (%)', 'agua_caliente_sanitaria_descripcion_ref': 'ACS Ref.: Desc.', 'agua_caliente_sanitaria_consumo_ref_kwh': 'ACS Ref. (kWh)', 'agua_caliente_sanitaria_consumo_ref_per': 'ACS Ref. (%)', 'energia_renovable_no_convencional_descripcion_ref': 'ERNC Ref.: Desc.', 'energia_renovable_no_convencional_consumo_ref_kwh': 'ERNC Ref. (kWh)', 'energia_renovable_no_convencional_consumo_ref_per': 'ERNC Ref. (%)', 'consumo_total_requerido_ref_kwh': 'Consumo Total Ref. (kWh)', 'consumo_ep_calefaccion_kwh': 'EP Consumo Calef. (kWh)', 'consumo_ep_agua_caliente_sanitaria_kwh': 'EP Consumo ACS (kWh)', 'consumo_ep_iluminacion_kwh': 'EP Consumo Ilum. (kWh)', 'consumo_ep_ventiladores_kwh': 'EP Consumo Vent. (kWh)', 'generacion_ep_fotovoltaicos_kwh': 'EP Gen. FV (kWh)', 'aporte_fotovoltaicos_consumos_basicos_kwh': 'EP Aporte FV (kWh)', 'diferencia_fotovoltaica_para_consumo_kwh': 'EP Dif. FV (kWh)', 'aporte_solar_termica_consumos_basicos_kwh': 'EP Aporte Solar T. (kWh)', 'aporte_solar_termica_agua_caliente_sanitaria_kwh': 'EP Aporte Solar T. ACS (kWh)', 'total_consumo_ep_antes_fotovoltaica_kwh': 'EP Total Antes FV (kWh)', 'aporte_fotovoltaicos_consumos_basicos_kwh_bis': 'EP Aporte FV Bis (kWh)', 'consumos_basicos_a_suplir_kwh': 'EP Consumos a Suplir (kWh)', 'consumo_total_ep_obj_kwh': 'Consumo Total EP Obj (kWh)', 'consumo_total_ep_ref_kwh': 'Consumo Total EP Ref (kWh)', 'coeficiente_energetico_c': 'Coeficiente Energético (C)' }
-RENAME_MAP_P3_ENVOLVENTE = { 'codigo_evaluacion': 'Código Evaluación', 'orientacion': 'Orientación', 'elementos_opacos_area_m2': 'Opacos: Área (m²)', 'elementos_opacos_U_W_m2_K': 'Opacos: U (W/m²K)', 'elementos_traslucidos_area_m2': 'Traslúcidos: Área (m²)', 'elementos_traslucidos_U_W_m2_K': 'Traslúcidos: U (W/m²K)', 'P01_W_K': 'PT P01 (W/K)', 'P02_W_K': 'PT P02 (W/K)', 'P03_W_K': 'PT P03 (W/K)', 'P04_W_K': 'PT P04 (W/K)', 'P05_W_K': 'PT P05 (W/K)', 'UA_phiL': 'Ht (UA + φL) (W/K)' }
-RENAME_MAP_P4 = { 'codigo_evaluacion': 'Código Evaluación', 'mes': 'Mes', 'demanda_calef_viv_eval_kwh': 'Dem. Calef. Eval. (kWh)', 'demanda_calef_viv_ref_kwh': 'Dem. Calef. Ref. (kWh)', 'demanda_enfri_viv_eval_kwh': 'Dem. Enfri. Eval. (kWh)', 'demanda_enfri_viv_ref_kwh': 'Dem. Enfri. Ref. (kWh)', 'sobrecalentamiento_viv_eval_hr': 'Sobrecalent. Eval. (hr)', 'sobrecalentamiento_viv_ref_hr': 'Sobrecalent. Ref. (hr)', 'sobreenfriamiento_viv_eval_hr': 'Sobreenfri. Eval. (hr)', 'sobreenfriamiento_viv_ref_hr': 'Sobreenfri. Ref. (hr)' }
-RENAME_MAP_P5_P6 = { 'codigo_evaluacion': 'Código Evaluación', 'content_note': 'Nota' }
-RENAME_MAP_P7 = { 'codigo_evaluacion': 'Código Evaluación', 'mandante_nombre': 'Mandante: Nombre', 'mandante_rut': 'Mandante: RUT', 'evaluador_nombre': 'Evaluador: Nombre', 'evaluador_rut': 'Evaluador: RUT', 'evaluador_rol_minvu': 'Evaluador: Rol MINVU' }
+# Read-only views: the module is shared by every session, so no rerun can alter a map in place
+RENAME_MAP_P1 = MappingProxyType({ "tipo_evaluacion": "Tipo de Evaluación", "codigo_evaluacion": "Código de Evaluación", "region": "Región", "comuna": "Comuna", "direccion": "Dirección", "rol_vivienda_proyecto": "Rol de Vivienda o Proyecto", "tipo_vivienda": "Tipo de Vivienda", "superficie_interior_util_m2": "Superficie Interior Útil (m²)", "porcentaje_ahorro": "Porcentaje de Ahorro (%)", "letra_eficiencia_energetica_dem": "Letra de Eficiencia Energética", "demanda_calefaccion_kwh_m2_ano": "Demanda Calefacción (kWh/m²/año)", "demanda_enfriamiento_kwh_m2_ano": "Demanda Enfriamiento (kWh/m²/año)", "demanda_total_kwh_m2_ano": "Demanda Total (kWh/m²/año)", "emitida_el": "Emitida el" })
+RENAME_MAP_P2 = MappingProxyType({ 'region': 'Región', 'comuna': 'Comuna', 'direccion': 'Dirección', 'rol_vivienda': 'Rol Vivienda', 'tipo_vivienda': 'Tipo Vivienda', 'zona_termica': 'Zona Térmica', 'superficie_interior_util_m2': 'Superficie Interior Útil (m²)', 'solicitado_por': 'Solicitado Por', 'evaluado_por': 'Evaluado Por', 'codigo_evaluacion': 'Código Evaluación', 'demanda_calefaccion_kwh_m2_ano': 'Demanda Calefacción Promedio (kWh/m²/año)', 'demanda_enfriamiento_kwh_m2_ano': 'Demanda Enfriamiento Promedio (kWh/m²/año)', 'demanda_total_kwh_m2_ano': 'Demanda Total Promedio (kWh/m²/año)', 'demanda_total_bis_kwh_m2_ano': 'Demanda Total Vivienda Eval. (kWh/m²/año)', 'demanda_total_referencia_kwh_m2_ano': 'Demanda Total Referencia (kWh/m²/año)', 'porcentaje_ahorro': 'Porcentaje Ahorro (%)', 'muro_principal_descripcion': 'Muro Principal: Descripción', 'muro_principal_exigencia_W_m2_K': 'Muro Principal: Exigencia (W/m²K)', 'muro_secundario_descripcion': 'Muro Secundario: Descripción', 'muro_secundario_exigencia_W_m2_K': 'Muro Secundario: Exigencia (W/m²K)', 'piso_principal_descripcion': 'Piso Principal: Descripción', 'piso_principal_exigencia_W_m2_K': 'Piso Principal: Exigencia (W/m²K)', 'puerta_principal_descripcion': 'Puerta Principal: Descripción', 'puerta_principal_exigencia': 'Puerta Principal: Exigencia', 'techo_principal_descripcion': 'Techo Principal: Descripción', 'techo_principal_exigencia_W_m2_K': 'Techo Principal: Exigencia (W/m²K)', 'techo_secundario_descripcion': 'Techo Secundario: Descripción', 'techo_secundario_exigencia_W_m2_K': 'Techo Secundario: Exigencia (W/m²K)', 'superficie_vidriada_principal_descripcion': 'Sup. Vidriada Principal: Descripción', 'superficie_vidriada_principal_exigencia': 'Sup. Vidriada Principal: Exigencia', 'superficie_vidriada_secundaria_descripcion': 'Sup. Vidriada Secundaria: Descripción', 'superficie_vidriada_secundaria_exigencia': 'Sup. Vidriada Secundaria: Exigencia', 'ventilacion_rah_descripcion': 'Ventilación (RAH): Descripción', 'ventilacion_rah_exigencia': 'Ventilación (RAH): Exigencia', 'infiltraciones_rah_descripcion': 'Infiltraciones (RAH): Descripción', 'infiltraciones_rah_exigencia': 'Infiltraciones (RAH): Exigencia' })
+RENAME_MAP_P3_CONSUMOS = MappingProxyType({ 'codigo_evaluacion': 'Código Evaluación', 'agua_caliente_sanitaria_kwh_m2': 'ACS (kWh/m²)', 'agua_caliente_sanitaria_perc': 'ACS (%)', 'iluminacion_kwh_m2': 'Iluminación (kWh/m²)', 'iluminacion_per': 'Iluminación (%)', 'calefaccion_kwh_m2': 'Calefacción (kWh/m²)', 'calefaccion_kwh_per': 'Calefacción (%)', 'energia_renovable_no_convencional_kwh_m2': 'ERNC (kWh/m²)', 'energia_renovable_no_convencional_per': 'ERNC (%)', 'consumo_total_kwh_m2': 'Consumo Total (kWh/m²)', 'emisiones_kgco2_m2_ano': 'Emisiones (kgCO₂e/m²/año)', 'calefaccion_descripcion_proy': 'Calefacción Proy.: Desc.', 'calefaccion_consumo_proy_kwh': 'Calefacción Proy. (kWh)', 'calefaccion_consumo_proy_per': 'Calefacción Proy. (%)', 'iluminacion_descripcion_proy': 'Iluminación Proy.: Desc.', 'iluminacion_consumo_proy_kwh': 'Iluminación Proy. (kWh)', 'iluminacion_consumo_proy_per': 'Iluminación Proy. (%)', 'agua_caliente_sanitaria_descripcion_proy': 'ACS Proy.: Desc.', 'agua_caliente_sanitaria_consumo_proy_kwh': 'ACS Proy. (kWh)', 'agua_caliente_sanitaria_consumo_proy_per': 'ACS Proy. (%)', 'energia_renovable_no_convencional_descripcion_proy': 'ERNC Proy.: Desc.', 'energia_renovable_no_convencional_consumo_proy_kwh': 'ERNC Proy. (kWh)', 'energia_renovable_no_convencional_consumo_proy_per': 'ERNC Proy. (%)', 'consumo_total_requerido_proy_kwh': 'Consumo Total Proy. (kWh)', 'calefaccion_descripcion_ref': 'Calefacción Ref.: Desc.', 'calefaccion_consumo_ref_kwh': 'Calefacción Ref. (kWh)', 'calefaccion_consumo_ref_per': 'Calefacción Ref. (%)', 'iluminacion_descripcion_ref': 'Iluminación Ref.: Desc.', 'iluminacion_consumo_ref_kwh': 'Iluminación Ref. (kWh)', 'iluminacion_consumo_ref_per': 'Iluminación Ref. (%)', 'agua_caliente_sanitaria_descripcion_ref': 'ACS Ref.: Desc.', 'agua_caliente_sanitaria_consumo_ref_kwh': 'ACS Ref. (kWh)', 'agua_caliente_sanitaria_consumo_ref_per': 'ACS Ref. (%)', 'energia_renovable_no_convencional_descripcion_ref': 'ERNC Ref.: Desc.', 'energia_renovable_no_convencional_consumo_ref_kwh': 'ERNC Ref. (kWh)', 'energia_renovable_no_convencional_consumo_ref_per': 'ERNC Ref. (%)', 'consumo_total_requerido_ref_kwh': 'Consumo Total Ref. (kWh)', 'consumo_ep_calefaccion_kwh': 'EP Consumo Calef. (kWh)', 'consumo_ep_agua_caliente_sanitaria_kwh': 'EP Consumo ACS (kWh)', 'consumo_ep_iluminacion_kwh': 'EP Consumo Ilum. (kWh)', 'consumo_ep_ventiladores_kwh': 'EP Consumo Vent. (kWh)', 'generacion_ep_fotovoltaicos_kwh': 'EP Gen. FV (kWh)', 'aporte_fotovoltaicos_consumos_basicos_kwh': 'EP Aporte FV (kWh)', 'diferencia_fotovoltaica_para_consumo_kwh': 'EP Dif. FV (kWh)', 'aporte_solar_termica_consumos_basicos_kwh': 'EP Aporte Solar T. (kWh)', 'aporte_solar_termica_agua_caliente_sanitaria_kwh': 'EP Aporte Solar T. ACS (kWh)', 'total_consumo_ep_antes_fotovoltaica_kwh': 'EP Total Antes FV (kWh)', 'aporte_fotovoltaicos_consumos_basicos_kwh_bis': 'EP Aporte FV Bis (kWh)', 'consumos_basicos_a_suplir_kwh': 'EP Consumos a Suplir (kWh)', 'consumo_total_ep_obj_kwh': 'Consumo Total EP Obj (kWh)', 'consumo_total_ep_ref_kwh': 'Consumo Total EP Ref (kWh)', 'coeficiente_energetico_c': 'Coeficiente Energético (C)' })
+RENAME_MAP_P3_ENVOLVENTE = MappingProxyType({ 'codigo_evaluacion': 'Código Evaluación', 'orientacion': 'Orientación', 'elementos_opacos_area_m2': 'Opacos: Área (m²)', 'elementos_opacos_U_W_m2_K': 'Opacos: U (W/m²K)', 'elementos_traslucidos_area_m2': 'Traslúcidos: Área (m²)', 'elementos_traslucidos_U_W_m2_K': 'Traslúcidos: U (W/m²K)', 'P01_W_K': 'PT P01 (W/K)', 'P02_W_K': 'PT P02 (W/K)', 'P03_W_K': 'PT P03 (W/K)', 'P04_W_K': 'PT P04 (W/K)', 'P05_W_K': 'PT P05 (W/K)', 'UA_phiL': 'Ht (UA + φL) (W/K)' })
+RENAME_MAP_P4 = MappingProxyType({ 'codigo_evaluacion': 'Código Evaluación', 'mes': 'Mes', 'demanda_calef_viv_eval_kwh': 'Dem. Calef. Eval. (kWh)', 'demanda_calef_viv_ref_kwh': 'Dem. Calef. Ref. (kWh)', 'demanda_enfri_viv_eval_kwh': 'Dem. Enfri. Eval. (kWh)', 'demanda_enfri_viv_ref_kwh': 'Dem. Enfri. Ref. (kWh)', 'sobrecalentamiento_viv_eval_hr': 'Sobrecalent. Eval. (hr)', 'sobrecalentamiento_viv_ref_hr': 'Sobrecalent. Ref. (hr)', 'sobreenfriamiento_viv_eval_hr': 'Sobreenfri. Eval. (hr)', 'sobreenfriamiento_viv_ref_hr': 'Sobreenfri. Ref. (hr)' })
+RENAME_MAP_P5_P6 = MappingProxyType({ 'codigo_evaluacion': 'Código Evaluación', 'content_note': 'Nota' })
+RENAME_MAP_P7 = MappingProxyType({ 'codigo_evaluacion': 'Código Evaluación', 'mandante_nombre': 'Mandante: Nombre', 'mandante_rut': 'Mandante: RUT', 'evaluador_nombre': 'Evaluador: Nombre', 'evaluador_rut': 'Evaluador: RUT', 'evaluador_rol_minvu': 'Evaluador: Rol MINVU' })
 
 # List of rename maps in the order of extracted_dfs
-ALL_RENAME_MAPS = [
+ALL_RENAME_MAPS = (
     RENAME_MAP_P1, RENAME_MAP_P2, RENAME_MAP_P3_CONSUMOS, RENAME_MAP_P3_ENVOLVENTE,
     RENAME_MAP_P4, RENAME_MAP_P5_P6, RENAME_MAP_P5_P6, RENAME_MAP_P7
-]
+)
+
+# --- Data Tab Content ---
+# Page Index -> sections shown on that page, each (Title, DF Index, Transpose Flag, Rename Map)
+_DATA_DISPATCH = (
+    (("Información General", 0, True, RENAME_MAP_P1),),                                                        # P1
+    (("Información Gral. / Demanda energética / Diseño de Arquitectura", 1, True, RENAME_MAP_P2),),            # P2
+    (("Consumo energético estimado ARQUITECTURA + EQUIPOS + TIPO DE ENERGÍA", 2, True, RENAME_MAP_P3_CONSUMOS), # P3 (Part 1)
+     ("Resumen Envolvente", 3, False, RENAME_MAP_P3_ENVOLVENTE)),                                               # P3 (Part 2)
+    (("Demanda, sobrecalentamiento y sobreenfriamiento mensual", 4, False, RENAME_MAP_P4),),                   # P4
+    (("Página 5 (No disponible)", 5, True, RENAME_MAP_P5_P6),),                                                # P5 (Placeholder) - Transpose=True
+    (("Página 6 (No disponible)", 6, True, RENAME_MAP_P5_P6),),                                                # P6 (Placeholder) - Transpose=True
+    (("Antecedentes de la evaluación", 7, True, RENAME_MAP_P7),),                                              # P7
+)
+
+# Characters Excel does not allow in sheet names
+_SHEET_SANITIZE_RE = re.compile(r'[\\/*?:\[\]]')
+
+def _safe_sheet_name(name: str) -> str:
+    """Sanitizes a sheet name (max 31 chars, no invalid chars like / ? * [ ] :); the precomputed EXCEL_SHEET_NAMES_SAFE are passed through."""
+    if name in EXCEL_SHEET_NAMES_SAFE: return name
+    return _SHEET_SANITIZE_RE.sub('_', name)[:31]
+
+# Excel sheet names in the order of extracted_dfs
+EXCEL_SHEET_NAMES = (
+    "Pagina1", "Pagina2", "Pagina3_Consumos", "Pagina3_Envolvente",
+    "Pagina4", "Pagina5", "Pagina6", "Pagina7"
+)
+# Sanitized once at import: these are the names every workbook uses
+EXCEL_SHEET_NAMES_SAFE = tuple(_SHEET_SANITIZE_RE.sub('_', s)[:31] for s in EXCEL_SHEET_NAMES)
 
 # --- Initialize Session State ---
-if 'uploaded_file_bytes' not in st.session_state: st.session_state.uploaded_file_bytes = None
 if 'extracted_data' not in st.session_state: st.session_state.extracted_data = None
+if 'display_payloads' not in st.session_state: st.session_state.display_payloads = None
 if 'processing_done' not in st.session_state: st.session_state.processing_done = False
 if 'file_name' not in st.session_state: st.session_state.file_name = None
 if 'last_uploaded_file_id' not in st.session_state: st.session_state.last_uploaded_file_id = None
+if 'file_digest' not in st.session_state: st.session_state.file_digest = None
+if 'excel_bytes' not in st.session_state: st.session_state.excel_bytes = None
+if 'excel_bytes_key' not in st.session_state: st.session_state.excel_bytes_key = None
+if 'failed_sections' not in st.session_state: st.session_state.failed_sections = []
 
 # --- Validation Function ---
+# Height of the page 1 band holding the report title, in report mm like every area in scraping_functions
+TITLE_BAND_HEIGHT_MM = 70.5
+
 def is_valid_cev_v2_pdf(pdf_doc: fitz.Document) -> bool:
     if not pdf_doc or len(pdf_doc) != 7: return False
     try:
-        text_upper = pdf_doc[0].get_text("text").upper()
-        valid = "PRECALIFICACIÓN ENERGÉTICA" in text_upper or "CALIFICACIÓN ENERGÉTICA" in text_upper
+        page = pdf_doc[0]
+        # One text pass over the title band at the top of page 1 ("CALIFICACIÓN ENERGÉTICA" also matches
+        # "PRECALIFICACIÓN ENERGÉTICA"), in any letter case
+        title_text = page.get_text("text", clip=fitz.Rect(0, 0, page.rect.width, TITLE_BAND_HEIGHT_MM * page.rect.height / REPORT_HEIGHT))
+        valid = "CALIFICACIÓN ENERGÉTICA" in title_text.upper()
         if valid: logging.info("Validation successful.")
         else: logging.warning("Validation failed: Keywords not found.")
         return valid
@@ -57,80 +113,179 @@ def is_valid_cev_v2_pdf(pdf_doc: fitz.Document) -> bool:
         return False
 
 # --- Display Functions ---
-def display_dataframe_with_title(title: str, data: pd.DataFrame, transpose: bool = False, rename_map: Optional[Dict[str, str]] = None):
-    """Displays a dataframe with title, optional rename, optional transpose."""
-    st.header(title)
-    if data is None or data.empty:
-        st.warning(f"No data available for this section.")
-        return
-
-    data_to_display = data.copy()
-    if rename_map:
-        cols_to_rename = {k: v for k, v in rename_map.items() if k in data_to_display.columns}
-        data_to_display = data_to_display.rename(columns=cols_to_rename)
+def _relabel(columns, rename_map: Mapping[str, str]) -> List[str]:
+    """Display labels for columns; one lookup per column, names missing from the map are kept."""
+    get = rename_map.get
+    return [get(c, c) for c in columns]
 
-    is_placeholder = 'content_note' in data.columns
-    placeholder_note_col = rename_map.get('content_note', 'content_note') if rename_map else 'content_note'
+# (note, table) for one section: the info note of a placeholder page and what st.dataframe shows; either may be None
+DisplayPayload = Tuple[Optional[str], Optional[Union[pd.DataFrame, pa.Table]]]
 
-    if is_placeholder and placeholder_note_col in data_to_display.columns:
-         note = data_to_display[placeholder_note_col].iloc[0]
-         if pd.notna(note): st.info(note)
-         if transpose:
-              cols_to_drop = [placeholder_note_col]; display_data = data_to_display.drop(columns=cols_to_drop, errors='ignore').T
-              if not display_data.empty:
-                  display_data.columns = [""]; dynamic_column_config = {col: st.column_config.Column(width=None) for col in display_data.columns}
-                  st.dataframe(display_data, column_config=dynamic_column_config)
-         return
+def build_display_payload(data: pd.DataFrame, transpose: bool = False, rename_map: Optional[Mapping[str, str]] = None) -> Optional[DisplayPayload]:
+    """Prepares one section for display: optional rename, optional transpose, Arrow conversion otherwise.
+    Returns None when there is no data."""
+    if data is None or data.empty:
+        return None
+
+    if 'content_note' in data.columns:
+         # The note is text when present; NaN/None/pd.NA are all non-str
+         # (`note == note` cannot be used: pd.NA from the Arrow-backed column has no truth value)
+         note = data.iat[0, data.columns.get_loc('content_note')]
+         note = note if isinstance(note, str) else None
+         if not transpose: return note, None
+         display_data = data.drop(columns=['content_note']).T
+         if display_data.empty: return note, None
+         if rename_map: display_data.index = _relabel(display_data.index, rename_map)
+         display_data.columns = [""]
+         return note, display_data
 
     if transpose:
-        display_data = data_to_display.T; display_data.columns = [""]
-    else:
-        display_data = data_to_display
-
-    dynamic_column_config = {col: st.column_config.Column(width=None) for col in display_data.columns}
-    st.dataframe(display_data, column_config=dynamic_column_config)
+        # .T already builds a new frame, so its labels can be set without copying `data` first
+        display_data = data.T
+        if rename_map: display_data.index = _relabel(display_data.index, rename_map)
+        display_data.columns = [""]
+        return None, display_data
+
+    arrow_table = _to_arrow_table(data, rename_map)
+    if arrow_table is not None:
+        return None, arrow_table
+    if rename_map is None:
+        return None, data
+    # Shallow copy: only the column labels change, the data blocks are shared with `data`
+    display_data = data.copy(deep=False)
+    display_data.columns = _relabel(display_data.columns, rename_map)
+    return None, display_data
+
+def build_display_payloads(dataframes: List[pd.DataFrame]) -> Tuple[Tuple[Tuple[str, Optional[DisplayPayload]], ...], ...]:
+    """Prepares every results page once per processed file, as (title, payload) sections following _DATA_DISPATCH."""
+    return tuple(
+        tuple((title, build_display_payload(dataframes[df_index], transpose_flag, rename_map)) for title, df_index, transpose_flag, rename_map in sections)
+        for sections in _DATA_DISPATCH
+    )
+
+def display_dataframe_with_title(title: str, payload: Optional[DisplayPayload]):
+    """Displays a section prepared by build_display_payload under its title."""
+    st.header(title)
+    if payload is None:
+        st.warning("No data available for this section.")
+        return
+    note, table = payload
+    if note is not None: st.info(note)
+    if table is not None: st.dataframe(table)
 
 
 # --- PDF Processing ---
-def process_pdf(pdf_document: fitz.Document, filename: str) -> Tuple[List[pd.DataFrame], List[str]]:
-    # ... (processing logic remains the same) ...
-    extracted_data_frames: List[pd.DataFrame] = []
-    base_names: List[str] = []
-    processing_steps = [
-        (get_informe_cev_v2_pagina1_as_dataframe, "Página 1"),
-        (get_informe_cev_v2_pagina2_as_dataframe, "Página 2"),
-        (get_informe_cev_v2_pagina3_consumos_as_dataframe, "Página 3 - Consumos"),
-        (get_informe_cev_v2_pagina3_envolvente_as_dataframe, "Página 3 - Envolvente"),
-        (get_informe_cev_v2_pagina4_as_dataframe, "Página 4"),
-        (get_informe_cev_v2_pagina5_as_dataframe, "Página 5"),
-        (get_informe_cev_v2_pagina6_as_dataframe, "Página 6"),
-        (get_informe_cev_v2_pagina7_as_dataframe, "Página 7"),
-    ]
-    progress_container = st.container()
-    progress_bar = progress_container.progress(0)
-    status_text = progress_container.empty()
-    total_steps = len(processing_steps)
-    for i, (func, base_name) in enumerate(processing_steps):
-        status_text.text(f"Procesando: {base_name}...")
-        try: df = func(pdf_document); extracted_data_frames.append(df); base_names.append(base_name); logging.info(f"Processed {base_name}")
-        except Exception as e: logging.error(f"Error processing {base_name}: {e}", exc_info=True); progress_container.warning(f"Error extracting '{base_name}'."); extracted_data_frames.append(pd.DataFrame()); base_names.append(base_name)
-        progress_bar.progress((i + 1) / total_steps)
-    status_text.success("Procesamiento completado.")
-    return extracted_data_frames, base_names
+@st.cache_resource
+def _get_extraction_pool() -> Optional[ProcessPoolExecutor]:
+    """Process pool shared by all sessions, started once per server; None on single-core hosts."""
+    workers = min(8, os.cpu_count() or 1)
+    if workers < 2: return None
+    return make_extraction_pool(workers)
+
+def process_pdf(pdf_document: fitz.Document, filename: str, pdf_bytes: Optional[Union[bytes, memoryview]] = None) -> Tuple[List[pd.DataFrame], List[str], List[str]]:
+    """Runs every page extractor. With pdf_bytes and a process pool, pages are extracted concurrently,
+    each worker opening its own document (PyMuPDF objects are not thread/process safe).
+    Returns the frames, their base names and the base names of the pages that failed (their frames are empty)."""
+    pool = _get_extraction_pool() if pdf_bytes is not None else None
+    if pool:
+        try:
+            return _process_pdf_in_pool(pool, bytes(pdf_bytes), filename) # Workers receive pickled bytes; a memoryview cannot be pickled
+        except BrokenProcessPool as e:
+            # A dead worker (e.g. out of memory) breaks the pool for good: drop it so the next upload starts a new one
+            logging.error(f"Extraction pool broken while processing {filename}, extracting serially: {e}", exc_info=True)
+            _get_extraction_pool.clear(); pool.shutdown(wait=False, cancel_futures=True)
+    failed: List[int] = []
+    extracted_data_frames = get_informe_cev_v2_as_dataframes(pdf_document, failed=failed)
+    logging.info(f"Processed {filename}")
+    return extracted_data_frames, list(PAGE_BASE_NAMES), [PAGE_BASE_NAMES[i] for i in failed]
+
+def _process_pdf_in_pool(pool: ProcessPoolExecutor, pdf_bytes: bytes, filename: str) -> Tuple[List[pd.DataFrame], List[str], List[str]]:
+    """Extracts the pages of one report concurrently, see process_pdf. One task per page: both page 3 tables go to the same worker,
+    which indexes that page once. A broken pool is raised to the caller; any other failed task marks its pages as failed."""
+    futures = {pool.submit(run_extractors_on_pdf_bytes, group, pdf_bytes): i for i, group in enumerate(PAGE_EXTRACTOR_GROUPS)}
+    group_starts = [sum(len(group) for group in PAGE_EXTRACTOR_GROUPS[:i]) for i in range(len(PAGE_EXTRACTOR_GROUPS))] # Position of each group's first page
+    # Collect pages as they finish; results are keyed by page group so the output order is kept
+    results: Dict[int, List[pd.DataFrame]] = {}
+    failed: List[int] = []
+    for future in as_completed(futures):
+        i = futures[future]
+        try:
+            results[i], failed_in_group = future.result()
+            failed.extend(group_starts[i] + j for j in failed_in_group); logging.info(f"Processed page group {i + 1} of {filename}")
+        except BrokenProcessPool: raise
+        except Exception as e:
+            logging.error(f"Error processing page group {i + 1} of {filename}: {e}", exc_info=True)
+            results[i] = [pd.DataFrame() for _ in PAGE_EXTRACTOR_GROUPS[i]]; failed.extend(range(group_starts[i], group_starts[i] + len(PAGE_EXTRACTOR_GROUPS[i])))
+    extracted_data_frames = [df for i in range(len(PAGE_EXTRACTOR_GROUPS)) for df in results[i]]
+    return extracted_data_frames, list(PAGE_BASE_NAMES), [PAGE_BASE_NAMES[i] for i in sorted(failed)]
+
+class _IncompleteExtraction(Exception):
+    """Raised out of _cached_extract when some pages failed, carrying its result: st.cache_data does not keep exceptions,
+    so a partial extraction is shown once and retried on the next upload instead of being cached under the file's digest."""
+    def __init__(self, result: Tuple[List[pd.DataFrame], List[str], List[str], bool]):
+        super().__init__(f"Failed pages: {', '.join(result[2])}")
+        self.result = result
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _cached_extract(file_digest: str, _pdf_data: Union[bytes, memoryview], _filename: str) -> Tuple[List[pd.DataFrame], List[str], List[str], bool]:
+    """Validates and extracts a PDF, cached on its content digest so re-runs on the same file are instant
+    (and Streamlit does not hash the whole PDF again). Returns the frames, their base names, the failed pages (always
+    empty here: a result with failed pages is raised as _IncompleteExtraction, see _extract) and the validity flag."""
+    with fitz.open(stream=_pdf_data, filetype="pdf") as pdf_doc:
+        if not is_valid_cev_v2_pdf(pdf_doc):
+            return [], [], [], False
+        extracted_dfs, base_names, failed_names = process_pdf(pdf_doc, _filename, pdf_bytes=_pdf_data)
+    # Arrow-backed dtypes: strings become contiguous buffers instead of one Python object per cell
+    extracted_dfs = [df.convert_dtypes(dtype_backend="pyarrow") for df in extracted_dfs]
+    if failed_names: raise _IncompleteExtraction((extracted_dfs, base_names, failed_names, True))
+    return extracted_dfs, base_names, failed_names, True
+
+def _extract(file_digest: str, pdf_data: Union[bytes, memoryview], filename: str) -> Tuple[List[pd.DataFrame], List[str], List[str], bool]:
+    """_cached_extract, also returning (uncached) a result in which some pages failed."""
+    try:
+        return _cached_extract(file_digest, pdf_data, filename)
+    except _IncompleteExtraction as e:
+        return e.result
+
+def _to_arrow_table(df: pd.DataFrame, rename_map: Optional[Mapping[str, str]] = None) -> Optional[pa.Table]:
+    """Converts a DataFrame to Arrow once, with its display column names; returns None if a column cannot be typed."""
+    if df is None or df.empty: return None
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        return table.rename_columns(_relabel(table.column_names, rename_map)) if rename_map else table
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        logging.warning(f"Could not convert DataFrame to Arrow, falling back to pandas display: {e}")
+        return None
+
+def _read_sample(path: str) -> Optional[bytes]:
+    """Reads a sample PDF; returns None if the file is missing."""
+    return Path(path).read_bytes() if os.path.exists(path) else None
+
+@st.cache_resource
+def _load_samples(paths: Tuple[str, ...]) -> Tuple[Optional[bytes], ...]:
+    """Reads the sample PDFs once per process, concurrently (file reads release the GIL)."""
+    with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+        return tuple(executor.map(_read_sample, paths))
 
 # --- Function to reset state ---
 def reset_state():
-    st.session_state.uploaded_file_bytes = None
     st.session_state.extracted_data = None
+    st.session_state.display_payloads = None
     st.session_state.processing_done = False
     st.session_state.file_name = None
     st.session_state.last_uploaded_file_id = None
+    st.session_state.file_digest = None
+    st.session_state.excel_bytes = None
+    st.session_state.excel_bytes_key = None
+    st.session_state.failed_sections = []
 
 # --- Function to create Excel File ---
-def create_multisheet_excel(dataframes_list: List[pd.DataFrame], sheet_names: List[str], rename_maps: List[Optional[Dict[str, str]]]) -> BytesIO:
+def create_multisheet_excel(dataframes_list: List[pd.DataFrame], sheet_names: List[str], rename_maps: List[Optional[Mapping[str, str]]]) -> BytesIO:
     """Creates a multi-sheet Excel file from a list of dataframes."""
     excel_buffer = BytesIO()
-    with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
+    # constant_memory is not used: pandas writes cells column by column, which that mode would drop.
+    # in_memory keeps the workbook parts off temporary files on disk; the workbook is only a few KB.
+    with pd.ExcelWriter(excel_buffer, engine='xlsxwriter', engine_kwargs={'options': {'strings_to_numbers': False, 'strings_to_urls': False, 'in_memory': True}}) as writer:
         if len(dataframes_list) != len(sheet_names) or len(dataframes_list) != len(rename_maps):
              logging.error("Mismatch between dataframes, sheet names, or rename maps for Excel generation.")
              # Write an error sheet? Or just return empty buffer? For now, return empty.
@@ -141,19 +296,14 @@ def create_multisheet_excel(dataframes_list: List[pd.DataFrame], sheet_names: Li
                 logging.info(f"Skipping empty dataframe for sheet '{sheet_names[i]}'")
                 continue # Skip empty dataframes
 
-            df_to_write = df_original.copy()
             rename_map = rename_maps[i]
+            # Display names go in as header aliases: the frames kept in session state are written as they are, no copy
+            header = _relabel(df_original.columns, rename_map) if rename_map else True
 
-            # Apply renaming if map exists
-            if rename_map:
-                cols_to_rename = {k: v for k, v in rename_map.items() if k in df_to_write.columns}
-                df_to_write = df_to_write.rename(columns=cols_to_rename)
-
-            # Sanitize sheet name (max 31 chars, no invalid chars like / ? * [ ] :)
-            safe_sheet_name = re.sub(r'[\\/*?:\[\]]', '_', sheet_names[i])[:31]
+            safe_sheet_name = _safe_sheet_name(sheet_names[i])
 
             try:
-                df_to_write.to_excel(writer, sheet_name=safe_sheet_name, index=False)
+                df_original.to_excel(writer, sheet_name=safe_sheet_name, index=False, header=header)
             except Exception as e:
                  logging.error(f"Error writing sheet '{safe_sheet_name}': {e}", exc_info=True)
                  # Optionally write a placeholder sheet indicating error
@@ -161,29 +311,39 @@ def create_multisheet_excel(dataframes_list: List[pd.DataFrame], sheet_names: Li
     excel_buffer.seek(0)
     return excel_buffer
 
+@st.cache_data(show_spinner=False, max_entries=8)
+def _build_excel(data_key: str, _dataframes: Tuple[pd.DataFrame, ...], sheet_names: Tuple[str, ...]) -> bytes:
+    """Builds the Excel bytes once per processed file; keyed on data_key instead of hashing the frames."""
+    return create_multisheet_excel(list(_dataframes), list(sheet_names), ALL_RENAME_MAPS).getvalue()
+
+def _store_excel_bytes():
+    """Builds the Excel for the current file and keeps the bytes in session state:
+    st.cache_data would hand back a fresh copy on every rerun."""
+    st.session_state.excel_bytes = _build_excel(
+        st.session_state.file_digest,
+        tuple(st.session_state.extracted_data),
+        EXCEL_SHEET_NAMES_SAFE
+    )
+    st.session_state.excel_bytes_key = st.session_state.file_digest
+
 # --- Main Application ---
 def main():
     st.set_page_config(layout="centered")
+    state = st.session_state # Bound once: every attribute access on st.session_state goes through its proxy
     st.title("Extractor de Datos Informe CEV v2")
 
     # --- Download Button (Conditional) ---
-    if st.session_state.processing_done and st.session_state.extracted_data:
-        excel_sheet_names = [
-            "Pagina1", "Pagina2", "Pagina3_Consumos", "Pagina3_Envolvente",
-            "Pagina4", "Pagina5", "Pagina6", "Pagina7"
-        ]
+    if state.processing_done and state.extracted_data:
         # Ensure we have the correct number of rename maps
-        if len(ALL_RENAME_MAPS) == len(st.session_state.extracted_data):
-             excel_data = create_multisheet_excel(
-                 st.session_state.extracted_data,
-                 excel_sheet_names,
-                 ALL_RENAME_MAPS
-             )
-             download_filename = f"{st.session_state.file_name.replace('.pdf', '')}_Extracted_Data.xlsx" if st.session_state.file_name else "Extracted_Data.xlsx"
+        if len(ALL_RENAME_MAPS) == len(state.extracted_data):
+             # Normally built right after extraction; this only covers a session that lost the bytes
+             if state.excel_bytes is None or state.excel_bytes_key != state.file_digest:
+                 _store_excel_bytes()
+             download_filename = f"{state.file_name.replace('.pdf', '')}_Extracted_Data.xlsx" if state.file_name else "Extracted_Data.xlsx"
 
              st.download_button(
                  label="Descargar Informe CEV (Excel)",
-                 data=excel_data,
+                 data=state.excel_bytes,
                  file_name=download_filename,
                  mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
                  key="download_excel_all"
@@ -193,8 +353,11 @@ def main():
 
 
     # --- Define Tabs ---
-    tab_titles = ["Subir Archivo PDF", "Página 1", "Página 2", "Página 3", "Página 4", "Página 5", "Página 6", "Página 7"]
-    tab_upload, tab_p1, tab_p2, tab_p3, tab_p4, tab_p5, tab_p6, tab_p7 = st.tabs(tab_titles)
+    # st.tabs renders every tab body on each rerun, so the report pages share one tab and only
+    # the page picked in the radio below is rendered.
+    tab_titles = ["Subir Archivo PDF", "Resultados"]
+    page_titles = ["Página 1", "Página 2", "Página 3", "Página 4", "Página 5", "Página 6", "Página 7"]
+    tab_upload, tab_results = st.tabs(tab_titles)
 
     # --- Upload Tab Content ---
     with tab_upload:
@@ -203,30 +366,36 @@ def main():
 
         if uploaded_file_widget is not None:
             current_file_id = uploaded_file_widget.file_id
-            if current_file_id != st.session_state.last_uploaded_file_id:
+            if current_file_id != state.last_uploaded_file_id:
                 st.info(f"Nuevo archivo detectado: '{uploaded_file_widget.name}'. Procesando...")
-                st.session_state.uploaded_file_bytes = uploaded_file_widget.getvalue(); st.session_state.file_name = uploaded_file_widget.name; st.session_state.last_uploaded_file_id = current_file_id; st.session_state.processing_done = False; st.session_state.extracted_data = None
-                processing_placeholder = st.empty()
+                # View on the uploaded buffer, no copy; only needed for this run, never kept in session state
+                pdf_data = uploaded_file_widget.getbuffer(); state.file_name = uploaded_file_widget.name
+                # Content hash: identical PDFs share the cached Excel regardless of file name or upload
+                state.file_digest = hashlib.blake2b(pdf_data, digest_size=16).hexdigest(); state.last_uploaded_file_id = current_file_id; state.processing_done = False; state.extracted_data = None; state.display_payloads = None
                 try:
-                    with fitz.open(stream=st.session_state.uploaded_file_bytes, filetype="pdf") as pdf_doc:
-                        processing_placeholder.info("Validando archivo...")
-                        if not is_valid_cev_v2_pdf(pdf_doc):
-                            st.error(f"Archivo '{st.session_state.file_name}' inválido o no soportado."); reset_state(); processing_placeholder.empty()
-                        else:
-                            processing_placeholder.info(f"Archivo válido. Procesando '{st.session_state.file_name}'...")
-                            extracted_dfs, base_names = process_pdf(pdf_doc, st.session_state.file_name)
-                            st.session_state.extracted_data = extracted_dfs; st.session_state.processing_done = True; processing_placeholder.empty(); st.success(f"Procesamiento de '{st.session_state.file_name}' completado.")
-                            # Use st.rerun() to refresh the interface cleanly after processing
-                            st.rerun()
+                    with st.spinner(f"Procesando '{state.file_name}'..."):
+                        extracted_dfs, base_names, failed_names, is_valid = _extract(state.file_digest, pdf_data, state.file_name)
+                    if not is_valid:
+                        st.error(f"Archivo '{state.file_name}' inválido o no soportado."); reset_state()
+                    else:
+                        state.extracted_data = extracted_dfs; state.display_payloads = build_display_payloads(extracted_dfs); state.processing_done = True
+                        state.failed_sections = failed_names # Warned about below on every run, as the rerun clears anything shown now
+                        _store_excel_bytes()
+                        # A toast survives the rerun below, unlike an inline st.success
+                        st.toast(f"Procesamiento de '{state.file_name}' completado.", icon="✅")
+                        # Use st.rerun() to refresh the interface cleanly after processing
+                        st.rerun()
                 except Exception as e:
-                    error_message=str(e).lower(); user_msg=f"Error inesperado procesando {st.session_state.file_name}: {e}"
-                    if any(err in error_message for err in ["cannot open", "damaged", "format error", "no objects found"]): user_msg=f"Error al leer PDF {st.session_state.file_name}. Podría estar dañado/protegido."
-                    log_msg=f"Error processing file {st.session_state.file_name}: {e}"; logging.error(log_msg, exc_info=True); st.error(user_msg); reset_state(); processing_placeholder.empty()
-            elif st.session_state.processing_done: st.success(f"Archivo '{st.session_state.file_name}' procesado correctamente.")
-            elif st.session_state.file_name: st.warning(f"Archivo '{st.session_state.file_name}' cargado, pero hubo error.")
+                    error_message=str(e).lower(); user_msg=f"Error inesperado procesando {state.file_name}: {e}"
+                    if any(err in error_message for err in ["cannot open", "damaged", "format error", "no objects found"]): user_msg=f"Error al leer PDF {state.file_name}. Podría estar dañado/protegido."
+                    log_msg=f"Error processing file {state.file_name}: {e}"; logging.error(log_msg, exc_info=True); st.error(user_msg); reset_state()
+            elif state.processing_done:
+                st.success(f"Archivo '{state.file_name}' procesado correctamente.")
+                for base_name in state.failed_sections: st.warning(f"Error extracting '{base_name}'.")
+            elif state.file_name: st.warning(f"Archivo '{state.file_name}' cargado, pero hubo error.")
         else:
-            if st.session_state.last_uploaded_file_id is not None: reset_state()
-            if not st.session_state.processing_done: st.info("Por favor, seleccione un archivo PDF.")
+            if state.last_uploaded_file_id is not None: reset_state()
+            if not state.processing_done: st.info("Por favor, seleccione un archivo PDF.")
         # --- Example File Download ---
         st.markdown("---"); st.subheader("Archivos de Ejemplo")
         st.markdown("""
@@ -237,27 +406,26 @@ def main():
 
         col1, col2 = st.columns(2)
 
-        if os.path.exists(SAMPLE_PDF_PRECAL_PATH):
-            with open(SAMPLE_PDF_PRECAL_PATH, "rb") as f:
-                with col1:
-                    st.download_button(
-                        "Descargar Ejemplo Precalificación Energética",
-                        data=f,
-                        type="primary",
-                        file_name=SAMPLE_PDF_PRECAL_NAME,
-                        mime="application/pdf"
-                    )
-
-        if os.path.exists(SAMPLE_PDF_CAL_PATH):
-            with open(SAMPLE_PDF_CAL_PATH, "rb") as f:
-                with col2:
-                    st.download_button(
-                        "Descargar Ejemplo Calificación Energética",
-                        data=f,
-                        type="primary",
-                        file_name=SAMPLE_PDF_CAL_NAME,
-                        mime="application/pdf"
-                    )
+        sample_precal_bytes, sample_cal_bytes = _load_samples((SAMPLE_PDF_PRECAL_PATH, SAMPLE_PDF_CAL_PATH))
+        if sample_precal_bytes is not None:
+            with col1:
+                st.download_button(
+                    "Descargar Ejemplo Precalificación Energética",
+                    data=sample_precal_bytes,
+                    type="primary",
+                    file_name=SAMPLE_PDF_PRECAL_NAME,
+                    mime="application/pdf"
+                )
+
+        if sample_cal_bytes is not None:
+            with col2:
+                st.download_button(
+                    "Descargar Ejemplo Calificación Energética",
+                    data=sample_cal_bytes,
+                    type="primary",
+                    file_name=SAMPLE_PDF_CAL_NAME,
+                    mime="application/pdf"
+                )
 
        
         # --- Links Section ---
@@ -268,37 +436,18 @@ def main():
         * [Buscador Público de Viviendas Calificadas](https://calificacionenergeticaweb.minvu.cl/Publico/BusquedaVivienda.aspx)
         """, unsafe_allow_html=True)
 
-    # --- Data Tab Content ---
-    data_tabs = [tab_p1, tab_p2, tab_p3, tab_p4, tab_p5, tab_p6, tab_p7]
-    # Structure: Tab Index -> (Title | [(Title, DF Index, Transpose Flag, Rename Map), ...], DF Index, Transpose Flag, Rename Map)
-    data_structure = {
-         0: ("Información General", 0, True, RENAME_MAP_P1),                      # P1
-         1: ("Información Gral. / Demanda energética / Diseño de Arquitectura", 1, True, RENAME_MAP_P2),                     # P2
-         2: [("Consumo energético estimado ARQUITECTURA + EQUIPOS + TIPO DE ENERGÍA", 2, True, RENAME_MAP_P3_CONSUMOS),             # P3 (Part 1)
-             ("Resumen Envolvente", 3, False, RENAME_MAP_P3_ENVOLVENTE)],       # P3 (Part 2)
-         3: ("Demanda, sobrecalentamiento y sobreenfriamiento mensual", 4, False, RENAME_MAP_P4),              # P4
-         4: ("Página 5 (No disponible)", 5, True, RENAME_MAP_P5_P6),                # P5 (Placeholder) - Transpose=True
-         5: ("Página 6 (No disponible)", 6, True, RENAME_MAP_P5_P6),                # P6 (Placeholder) - Transpose=True
-         6: ("Antecedentes de la evaluación", 7, True, RENAME_MAP_P7)                      # P7
-    }
-
-    for i, tab in enumerate(data_tabs):
-        with tab:
-            if st.session_state.processing_done and st.session_state.extracted_data and len(st.session_state.extracted_data) == 8:
-                if st.session_state.file_name: st.caption(f"Mostrando resultados para: {st.session_state.file_name}")
-                structure_info = data_structure[i]
-                if isinstance(structure_info, list): # Handle combined Page 3
-                    part1 = structure_info[0]; part2 = structure_info[1]
-                    display_dataframe_with_title(part1[0], st.session_state.extracted_data[part1[1]], transpose=part1[2], rename_map=part1[3])
-                    st.markdown("---")
-                    display_dataframe_with_title(part2[0], st.session_state.extracted_data[part2[1]], transpose=part2[2], rename_map=part2[3])
-                else: # Handle single page tabs
-                    title, df_index, transpose_flag, rename_map_dict = structure_info
-                    # Check if rename_map_dict is None before passing, although it shouldn't be based on data_structure
-                    current_rename_map = rename_map_dict if rename_map_dict else None
-                    display_dataframe_with_title(title, st.session_state.extracted_data[df_index], transpose=transpose_flag, rename_map=current_rename_map)
-            else:
-                 st.info("Suba un archivo PDF válido en la pestaña 'Subir Archivo PDF' para ver los datos.")
+    # Evaluated after the upload handler, which may have reset the state
+    results_ready = bool(state.processing_done and state.display_payloads)
+    with tab_results:
+        if results_ready:
+            if state.file_name: st.caption(f"Mostrando resultados para: {state.file_name}")
+            selected_page = st.radio("Página", page_titles, horizontal=True, key="page_sel", label_visibility="collapsed")
+            # Payloads are prepared once after extraction; a rerun only hands them to Streamlit
+            for j, (title, payload) in enumerate(state.display_payloads[page_titles.index(selected_page)]):
+                if j: st.markdown("---")
+                display_dataframe_with_title(title, payload)
+        else:
+             st.info("Suba un archivo PDF válido en la pestaña 'Subir Archivo PDF' para ver los datos.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
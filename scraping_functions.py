@@ -1,6 +1,8 @@
-from bisect import bisect_left
-from typing import Dict, Tuple, Any, List, Union, Optional # Added Optional
-from functools import lru_cache
+from typing import Dict, Tuple, Any, List, Union, Optional, Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import re
 import pandas as pd
 import fitz  # PyMuPDF
 import logging
@@ -8,7 +10,6 @@ import logging
 # Configure logging (ensure it's configured somewhere, e.g., here or in app.py)
 # logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-@lru_cache(maxsize=128)
 def normalize_coordinates(
     x: float,
     y: float,
@@ -17,7 +18,7 @@ def normalize_coordinates(
     page_width: float,
     page_height: float
 ) -> Tuple[float, float]:
-    """Normalize coordinates with caching for repeated calculations."""
+    """Normalize report coordinates to page coordinates (page extractors scale by a per-page factor instead)."""
     try:
         rx = (x / report_width) * page_width
         ry = (y / report_height) * page_height
@@ -26,9 +27,63 @@ def normalize_coordinates(
         logging.error("Report width or height cannot be zero for normalization.")
         return 0.0, 0.0
 
-def extract_text_from_area(page: fitz.Page, area: Tuple[float, float, float, float]) -> str:
+# Page size of the report layout, the unit of every coordinate below
+REPORT_WIDTH = 215.9  # mm
+REPORT_HEIGHT = 330.0  # mm
+
+# (x0, y0, x1, y1, chars) per text line, chars being (x0, y0, x1, y1, c) tuples
+TextLine = Tuple[float, float, float, float, List[Tuple[float, float, float, float, str]]]
+
+def get_page_text_lines(page: fitz.Page) -> List[TextLine]:
+    """
+    Extract the characters of a page once, grouped by text line in reading order.
+    Uses the same text page settings as page.get_textbox, so _text_in_rect gives identical results.
+    """
+    text_lines: List[TextLine] = []
+    for block in page.get_textpage().extractRAWDICT()['blocks']:
+        if block.get('type', 0) != 0: continue # Image block
+        for line in block['lines']:
+            chars = [(*char['bbox'], char['c']) for span in line['spans'] for char in span['chars']]
+            if chars:
+                text_lines.append((*line['bbox'], chars)) # MuPDF's line bbox is the union of its char boxes
+    return text_lines
+
+def _text_in_rect(text_lines: List[TextLine], x0: float, y0: float, x1: float, y1: float) -> str:
+    """
+    Same selection as fitz's extractTextbox: every character whose box overlaps the rectangle,
+    one output line per text line that contributed characters.
+    """
+    found: List[str] = []
+    for lx0, ly0, lx1, ly1, chars in text_lines:
+        if x0 >= lx1 or y0 >= ly1 or x1 <= lx0 or y1 <= ly0: continue # Whole line is outside
+        text = ''.join(c for cx0, cy0, cx1, cy1, c in chars if not (x0 >= cx1 or y0 >= cy1 or x1 <= cx0 or y1 <= cy0))
+        if text: found.append(text)
+    return '\n'.join(found)
+
+def _extract_text_from_area_fast(text_lines: List[TextLine], rx1: float, ry1: float, rx2: float, ry2: float) -> str:
+    """
+    Hot path for the page extractors: already normalized page coordinates, no validation.
+    extract_text_from_area is the checked entry point.
+    """
+    return _text_in_rect(text_lines, rx1, ry1, rx2, ry2).strip()
+
+def _page_area_reader(page: fitz.Page, text_lines: Optional[List[TextLine]] = None) -> Callable[[Tuple[float, float, float, float]], str]:
+    """
+    Area reader for the page extractors: takes (x1, y1, x2, y2) in report mm and returns that area's text from the
+    page's get_page_text_lines index, built here unless passed in (even for a single area, that beats get_textbox's
+    per-character walk over the whole page). No validation, see _extract_text_from_area_fast.
+    """
+    if text_lines is None: text_lines = get_page_text_lines(page)
+    sx = page.rect.width / REPORT_WIDTH; sy = page.rect.height / REPORT_HEIGHT # Report mm -> page points
+    def read_area(area: Tuple[float, float, float, float]) -> str:
+        x1, y1, x2, y2 = area
+        return _extract_text_from_area_fast(text_lines, x1 * sx, y1 * sy, x2 * sx, y2 * sy)
+    return read_area
+
+def extract_text_from_area(page: fitz.Page, area: Tuple[float, float, float, float], text_lines: Optional[List[TextLine]] = None) -> str:
     """
     Extract text from a specific area of a PDF page. Robust error handling.
+    Pass the page's get_page_text_lines result when reading several areas, so the page text is extracted only once.
     """
     if not isinstance(page, fitz.Page):
         logging.error("Invalid page object provided to extract_text_from_area.")
@@ -39,9 +94,6 @@ def extract_text_from_area(page: fitz.Page, area: Tuple[float, float, float, flo
         logging.error(f"Invalid area format provided: {area}. Must be a tuple of 4 coordinates.")
         return ""
 
-    REPORT_WIDTH = 215.9  # mm
-    REPORT_HEIGHT = 330.0  # mm
-
     try:
         page_rect = page.rect
         if page_rect is None:
@@ -72,15 +124,11 @@ def extract_text_from_area(page: fitz.Page, area: Tuple[float, float, float, flo
              logging.warning(f"Normalized coordinates resulted in invalid rectangle: ({rx1}, {ry1}, {rx2}, {ry2}) from area {area}")
              return ""
 
-        rect = fitz.Rect(rx1, ry1, rx2, ry2)
-        extracted_text = page.get_textbox(rect) # Use get_textbox for better layout preservation than get_text
-        return extracted_text.strip() if extracted_text else ""
+        if text_lines is None:
+            text_lines = get_page_text_lines(page) # Same text as page.get_textbox, without its per-character walk in Python
+        return _extract_text_from_area_fast(text_lines, rx1, ry1, rx2, ry2)
 
-    except ZeroDivisionError:
-        # This might occur if normalize_coordinates fails due to zero report dimensions
-        logging.error("Division by zero error during coordinate normalization in extract_text_from_area.")
-        return ""
-    except Exception as e:
+    except Exception as e: # MuPDF errors derive from Exception directly
         logging.error(f"Unexpected error extracting text from area {area}: {e}", exc_info=True)
         return ""
 
@@ -97,9 +145,27 @@ def safe_float_convert(text: Optional[str], default: Any = None) -> Union[float,
         # Basic check if it looks like a number (allows negative, scientific notation)
         return float(cleaned_text)
     except (ValueError, TypeError):
-        logging.warning(f"Could not convert '{text}' to float.")
+        logging.debug("Could not convert '%s' to float.", text) # Routine for empty or multi-value cells
         return default
 
+def _last_line(text: str) -> str:
+    """Last line of a field's text (its value: labels and units sit above it), without splitting the whole string."""
+    return text[text.rfind('\n') + 1:]
+
+def _clean_desc(text: str) -> str:
+    """Join a multi-line text field into one line."""
+    return text.replace('\n', ' ').strip()
+
+def _last_line_float(text: str) -> Optional[float]:
+    """Value printed on the last line of a field (labels and units sit above it)."""
+    if not text: return None # Empty cells are common (e.g. no renewable energy)
+    return safe_float_convert(_last_line(text).strip())
+
+# Savings-percentage cutpoints (e.g. -0.35 corresponds to -35%) and the grade for each band
+AHORRO_BOUNDARIES = (-0.35, -0.1, 0.2, 0.4, 0.55, 0.7, 0.85, 100.0) # Using 100.0 for clarity beyond A+
+AHORRO_GRADES = ('G', 'F', 'E', 'D', 'C', 'B', 'A', 'A+')
+
+
 def _from_procentaje_ahorro_to_letra(porcentaje_ahorro_decimal: Optional[float]) -> Optional[str]:
     """
     Convert a savings percentage (as a float, e.g., 0.75 for 75%) to a corresponding letter grade.
@@ -107,29 +173,52 @@ def _from_procentaje_ahorro_to_letra(porcentaje_ahorro_decimal: Optional[float])
     """
     if porcentaje_ahorro_decimal is None:
         return None
-    # Boundaries defined based on the percentage value (e.g., -0.35 corresponds to -35%)
-    boundaries = [-0.35, -0.1, 0.2, 0.4, 0.55, 0.7, 0.85, 100.0] # Using 100.0 for clarity beyond A+
-    grades = ['G', 'F', 'E', 'D', 'C', 'B', 'A', 'A+']
 
     try:
-        idx = bisect_left(boundaries, porcentaje_ahorro_decimal)
-        if 0 <= idx < len(grades):
-            return grades[idx]
-        else:
-             # Handle cases where percentage is outside the defined boundaries (e.g., > 100 or extremely negative)
-             logging.warning(f"Percentage {porcentaje_ahorro_decimal*100}% resulted in out-of-bounds grade index {idx}.")
-             if idx >= len(grades): return grades[-1] # Assign highest grade if above top boundary
-             else: return grades[0] # Assign lowest grade if below bottom boundary
-
+        # Number of cutpoints strictly below the value (same index bisect_left would give)
+        idx = sum(porcentaje_ahorro_decimal > b for b in AHORRO_BOUNDARIES)
     except TypeError:
          logging.error(f"Invalid type for percentage: {porcentaje_ahorro_decimal}. Cannot determine grade.")
          return None
 
+    if idx < len(AHORRO_GRADES):
+        return AHORRO_GRADES[idx]
+    # Percentage above the top boundary
+    logging.warning(f"Percentage {porcentaje_ahorro_decimal*100}% resulted in out-of-bounds grade index {idx}.")
+    return AHORRO_GRADES[-1]
+
 
 # ------------------------------------------------------------------------------------------------------------
 #  Pagina 1
 # ------------------------------------------------------------------------------------------------------------
 
+# Page 1 field areas in report mm, (key, (x1, y1, x2, y2))
+PAGINA1_COORDINATES: Tuple[Tuple[str, Tuple[float, float, float, float]], ...] = (
+    ('tipo_evaluacion', (8.3, 10.3, 165.6, 18.8)),
+    ('codigo_evaluacion', (73.1, 20.0, 95.6, 25.1)),
+    ('region', (28.0, 26.6, 80.0, 31.8)),
+    ('comuna', (29.2, 33.0, 80.0, 38.2)),
+    ('direccion', (31.3, 39.1, 155.3, 44.3)),
+    ('rol_vivienda_proyecto', (57.4, 45.6, 74.8, 50.8)),
+    ('tipo_vivienda', (45.9, 51.7, 155.3, 56.9)),
+    ('superficie_interior_util_m2', (54.2, 58.3, 66.0, 63.5)),
+    ('porcentaje_ahorro_raw', (5.6, 78.6, 165.8, 191.3)), # Raw text block
+    ('demanda_calefaccion_kwh_m2_ano_raw', (15.6, 220.0, 73.0, 230.0)), # Raw text block
+    ('demanda_enfriamiento_kwh_m2_ano_raw', (90.0, 220.0, 151.5, 230.0)), # Raw text block
+    ('demanda_total_kwh_m2_ano_raw', (167.0, 225.0, 209.0, 245.0)), # Raw text block
+    ('emitida_el_raw', (34.5, 247.5, 57.0, 252.8)), # Raw text block
+)
+
+# First line of the savings block that is a bare (possibly negative) integer: the percentage
+PORCENTAJE_AHORRO_RE = re.compile(r'^-?\d+$', re.MULTILINE)
+
+# Page 1 output columns, in the order of get_informe_cev_v2_pagina1_as_dict
+PAGINA1_COLUMNS = (
+    'tipo_evaluacion', 'codigo_evaluacion', 'region', 'comuna', 'direccion', 'rol_vivienda_proyecto', 'tipo_vivienda',
+    'superficie_interior_util_m2', 'porcentaje_ahorro', 'letra_eficiencia_energetica_dem',
+    'demanda_calefaccion_kwh_m2_ano', 'demanda_enfriamiento_kwh_m2_ano', 'demanda_total_kwh_m2_ano', 'emitida_el',
+)
+
 def get_informe_cev_v2_pagina1_as_dict(pdf_report: fitz.Document) -> Dict[str, Any]:
     """
     Extract data from page 1 of an informe_CEV_v2 PDF report and return it as a dictionary.
@@ -140,50 +229,32 @@ def get_informe_cev_v2_pagina1_as_dict(pdf_report: fitz.Document) -> Dict[str, A
         if not isinstance(pdf_report, fitz.Document): raise TypeError("Input must be a fitz.Document object.")
         if len(pdf_report) < 1: raise ValueError("PDF has no pages.")
         page = pdf_report[0]
+        read_area = _page_area_reader(page)
 
-        COORDINATES: Dict[str, Tuple[float, float, float, float]] = {
-            'tipo_evaluacion': (8.3, 10.3, 165.6, 18.8),
-            'codigo_evaluacion': (73.1, 20.0, 95.6, 25.1),
-            'region': (28.0, 26.6, 80.0, 31.8),
-            'comuna': (29.2, 33.0, 80.0, 38.2),
-            'direccion': (31.3, 39.1, 155.3, 44.3),
-            'rol_vivienda_proyecto': (57.4, 45.6, 74.8, 50.8),
-            'tipo_vivienda':(45.9, 51.7, 155.3, 56.9),
-            'superficie_interior_util_m2': (54.2, 58.3, 66.0, 63.5),
-            'porcentaje_ahorro_raw': (5.6, 78.6, 165.8, 191.3), # Raw text block
-            'demanda_calefaccion_kwh_m2_ano_raw': (15.6, 220.0, 73.0, 230.0), # Raw text block
-            'demanda_enfriamiento_kwh_m2_ano_raw': (90.0, 220.0, 151.5, 230.0), # Raw text block
-            'demanda_total_kwh_m2_ano_raw': (167.0, 225.0, 209.0, 245.0), # Raw text block
-            'emitida_el_raw': (34.5, 247.5, 57.0, 252.8) # Raw text block
-        }
-
-        fields: Dict[str, str] = { k: extract_text_from_area(page, v) for k, v in COORDINATES.items() }
+        fields: Dict[str, str] = { k: read_area(area) for k, area in PAGINA1_COORDINATES }
 
         # Post-processing with safe conversion
-        porcentaje_ahorro_str = next((line for line in fields.get('porcentaje_ahorro_raw', '').splitlines() if line.replace('-', '').isdigit()), None)
-        porcentaje_ahorro_int = int(porcentaje_ahorro_str) if porcentaje_ahorro_str is not None else None
+        porcentaje_ahorro_match = PORCENTAJE_AHORRO_RE.search(fields['porcentaje_ahorro_raw'])
+        porcentaje_ahorro_int = int(porcentaje_ahorro_match.group()) if porcentaje_ahorro_match else None
         porcentaje_ahorro_decimal = float(porcentaje_ahorro_int / 100.0) if porcentaje_ahorro_int is not None else None
 
-        demanda_cal_str = fields.get('demanda_calefaccion_kwh_m2_ano_raw', '').splitlines()
-        demanda_enf_str = fields.get('demanda_enfriamiento_kwh_m2_ano_raw', '').splitlines()
-        demanda_tot_str = fields.get('demanda_total_kwh_m2_ano_raw', '').splitlines()
-        emitida_str = fields.get('emitida_el_raw', '').splitlines()
+        emitida_raw = fields['emitida_el_raw']
 
         result = {
-            'tipo_evaluacion': fields.get('tipo_evaluacion', '').strip(),
-            'codigo_evaluacion': fields.get('codigo_evaluacion', '').strip(),
-            'region': fields.get('region', '').strip(),
-            'comuna': fields.get('comuna', '').strip(),
-            'direccion': fields.get('direccion', '').strip(),
-            'rol_vivienda_proyecto': fields.get('rol_vivienda_proyecto', '').strip(),
-            'tipo_vivienda': fields.get('tipo_vivienda', '').strip(),
-            'superficie_interior_util_m2': safe_float_convert(fields.get('superficie_interior_util_m2')),
+            'tipo_evaluacion': fields['tipo_evaluacion'],
+            'codigo_evaluacion': fields['codigo_evaluacion'],
+            'region': fields['region'],
+            'comuna': fields['comuna'],
+            'direccion': fields['direccion'],
+            'rol_vivienda_proyecto': fields['rol_vivienda_proyecto'],
+            'tipo_vivienda': fields['tipo_vivienda'],
+            'superficie_interior_util_m2': safe_float_convert(fields['superficie_interior_util_m2']),
             'porcentaje_ahorro': porcentaje_ahorro_int, # Keep as integer %
             'letra_eficiencia_energetica_dem': _from_procentaje_ahorro_to_letra(porcentaje_ahorro_decimal),
-            'demanda_calefaccion_kwh_m2_ano': safe_float_convert(demanda_cal_str[-1] if demanda_cal_str else None),
-            'demanda_enfriamiento_kwh_m2_ano': safe_float_convert(demanda_enf_str[-1] if demanda_enf_str else None),
-            'demanda_total_kwh_m2_ano': safe_float_convert(demanda_tot_str[-1] if demanda_tot_str else None),
-            'emitida_el': emitida_str[-1].strip() if emitida_str else None
+            'demanda_calefaccion_kwh_m2_ano': safe_float_convert(_last_line(fields['demanda_calefaccion_kwh_m2_ano_raw'])),
+            'demanda_enfriamiento_kwh_m2_ano': safe_float_convert(_last_line(fields['demanda_enfriamiento_kwh_m2_ano_raw'])),
+            'demanda_total_kwh_m2_ano': safe_float_convert(_last_line(fields['demanda_total_kwh_m2_ano_raw'])),
+            'emitida_el': _last_line(emitida_raw).strip() if emitida_raw else None
         }
         return result
 
@@ -196,7 +267,7 @@ def get_informe_cev_v2_pagina1_as_dataframe(pdf_report: fitz.Document) -> pd.Dat
     data_dict = get_informe_cev_v2_pagina1_as_dict(pdf_report)
     if not data_dict: return pd.DataFrame()
     try:
-        return pd.DataFrame.from_dict(data_dict, orient='index').T
+        return pd.DataFrame([data_dict])
     except Exception as e:
          logging.error(f"Failed to convert page 1 dict to DataFrame: {e}", exc_info=True)
          return pd.DataFrame()
@@ -206,6 +277,46 @@ def get_informe_cev_v2_pagina1_as_dataframe(pdf_report: fitz.Document) -> pd.Dat
 #  Pagina 2
 # ------------------------------------------------------------------------------------------------------------
 
+def _wm2k_float(text: str) -> Optional[float]:
+    """Envelope requirement printed as "<value> [W/m2K]"."""
+    return safe_float_convert(text.replace('[W/m2K]', '').strip())
+
+# (output key, raw field key, parser) in output order; built once at import instead of per report
+PAGINA2_PARSERS: Tuple[Tuple[str, str, Callable[[str], Any]], ...] = (
+    ('region', 'region', _clean_desc), ('comuna', 'comuna', _clean_desc), ('direccion', 'direccion', _clean_desc), ('rol_vivienda', 'rol_vivienda', _clean_desc), ('tipo_vivienda', 'tipo_vivienda', _clean_desc),
+    ('zona_termica', 'zona_termica', _clean_desc), ('superficie_interior_util_m2', 'superficie_interior_util_m2_raw', safe_float_convert), ('solicitado_por', 'solicitado_por', _clean_desc), ('evaluado_por', 'evaluado_por', _clean_desc), ('codigo_evaluacion', 'codigo_evaluacion', _clean_desc),
+    ('demanda_calefaccion_kwh_m2_ano', 'demanda_calefaccion_kwh_m2_ano_raw', _last_line_float), ('demanda_enfriamiento_kwh_m2_ano', 'demanda_enfriamiento_kwh_m2_ano_raw', _last_line_float), ('demanda_total_kwh_m2_ano', 'demanda_total_kwh_m2_ano_raw', _last_line_float),
+    ('demanda_total_bis_kwh_m2_ano', 'demanda_total_bis_kwh_m2_ano_raw', _last_line_float), ('demanda_total_referencia_kwh_m2_ano', 'demanda_total_referencia_kwh_m2_ano_raw', _last_line_float), ('porcentaje_ahorro', 'porcentaje_ahorro_raw', _last_line_float),
+    ('muro_principal_descripcion', 'muro_principal_descripcion', _clean_desc), ('muro_principal_exigencia_W_m2_K', 'muro_principal_exigencia_raw', _wm2k_float),
+    ('muro_secundario_descripcion', 'muro_secundario_descripcion', _clean_desc), ('muro_secundario_exigencia_W_m2_K', 'muro_secundario_exigencia_raw', _wm2k_float),
+    ('piso_principal_descripcion', 'piso_principal_descripcion', _clean_desc), ('piso_principal_exigencia_W_m2_K', 'piso_principal_exigencia_raw', _wm2k_float),
+    ('puerta_principal_descripcion', 'puerta_principal_descripcion', _clean_desc), ('puerta_principal_exigencia', 'puerta_principal_exigencia_raw', _clean_desc), # Textual
+    ('techo_principal_descripcion', 'techo_principal_descripcion', _clean_desc), ('techo_principal_exigencia_W_m2_K', 'techo_principal_exigencia_raw', _wm2k_float),
+    ('techo_secundario_descripcion', 'techo_secundario_descripcion', _clean_desc), ('techo_secundario_exigencia_W_m2_K', 'techo_secundario_exigencia_raw', _wm2k_float),
+    ('superficie_vidriada_principal_descripcion', 'superficie_vidriada_principal_descripcion', _clean_desc), ('superficie_vidriada_principal_exigencia', 'superficie_vidriada_principal_exigencia', _clean_desc), # Textual
+    ('superficie_vidriada_secundaria_descripcion', 'superficie_vidriada_secundaria_descripcion', _clean_desc), ('superficie_vidriada_secundaria_exigencia', 'superficie_vidriada_secundaria_exigencia', _clean_desc), # Textual
+    ('ventilacion_rah_descripcion', 'ventilacion_rah_descripcion', _clean_desc), ('ventilacion_rah_exigencia', 'ventilacion_rah_exigencia', _clean_desc), # Textual
+    ('infiltraciones_rah_descripcion', 'infiltraciones_rah_descripcion', _clean_desc), ('infiltraciones_rah_exigencia', 'infiltraciones_rah_exigencia', _clean_desc), # Textual
+)
+
+# Page 2 field areas in report mm, (key, (x1, y1, x2, y2))
+PAGINA2_COORDINATES: Tuple[Tuple[str, Tuple[float, float, float, float]], ...] = (
+    ('region', (40.4,47.4,95.0,51.7)), ('comuna', (40.4,53.2,95.0,57.4)), ('direccion', (40.4,58.9,95.0,63.1)), ('rol_vivienda', (40.4,64.6,95.0,68.9)), ('tipo_vivienda', (40.4,70.2,95.0,74.4)),
+    ('zona_termica', (143.8,47.5,146.1,51.7)), ('superficie_interior_util_m2_raw', (143.8,53.3,150,57.5)), ('solicitado_por', (143.8,58.9,185.5,63.1)), ('evaluado_por', (143.8,64.7,210.5,68.9)), ('codigo_evaluacion', (143.8,70.2,160.6,74.5)),
+    ('demanda_calefaccion_kwh_m2_ano_raw', (99.4,99.6,107.6,105.2)), ('demanda_enfriamiento_kwh_m2_ano_raw', (99.2,120.9,107.5,126.5)), ('demanda_total_kwh_m2_ano_raw', (101.5,135.1,130.6,151.4)),
+    ('demanda_total_bis_kwh_m2_ano_raw', (39.2, 159.8, 122.8, 166.0)), ('demanda_total_referencia_kwh_m2_ano_raw', (16.9, 168.3, 146.2, 173.2)), ('porcentaje_ahorro_raw', (152.0, 162.6, 201.5, 168.7)),
+    ('muro_principal_descripcion', (46.2, 202.2, 184.5, 209.1)), ('muro_principal_exigencia_raw', (185.5, 204.2, 209.5, 209.1)),
+    ('muro_secundario_descripcion', (46.2, 209.2, 184.5, 215.1)), ('muro_secundario_exigencia_raw', (185.5,211.5,209.5,214.3)),
+    ('piso_principal_descripcion', (46.7,216.6,184.5,219.4)), ('piso_principal_exigencia_raw', (185.5, 216.4, 209.5, 223.7)),
+    ('puerta_principal_descripcion', (46.2, 223.5, 184.5, 230.2)), ('puerta_principal_exigencia_raw', (185.5, 223.9, 209.5, 230.2)), # Textual
+    ('techo_principal_descripcion', (46.2, 230.5, 184.5, 237.0)), ('techo_principal_exigencia_raw', (185.5, 230.5, 209.5, 237.2)),
+    ('techo_secundario_descripcion', (46.2, 237.2, 184.5, 244.1)), ('techo_secundario_exigencia_raw', (185.5, 237.2, 209.5, 244.1)),
+    ('superficie_vidriada_principal_descripcion', (46.2, 244.2, 184.5, 251.0)), ('superficie_vidriada_principal_exigencia', (185.5, 244.3, 209.5, 251.0)), # Textual
+    ('superficie_vidriada_secundaria_descripcion', (46.2, 251.3, 184.5, 258.0)), ('superficie_vidriada_secundaria_exigencia', (185.5, 251.3, 209.5, 258.0)), # Textual
+    ('ventilacion_rah_descripcion', (46.2, 258.3, 184.5, 265.0)), ('ventilacion_rah_exigencia', (185.5, 258.3, 209.5, 265.0)), # Textual
+    ('infiltraciones_rah_descripcion', (46.2, 265.3, 184.5, 272.0)), ('infiltraciones_rah_exigencia', (185.5, 265.3, 209.5, 272.0)), # Textual
+)
+
 def get_informe_cev_v2_pagina2_as_dict(pdf_report: fitz.Document) -> Dict[str, Any]:
     """
     Extract data from page 2 of an informe_CEV_v2 PDF report and return it as a dictionary.
@@ -216,48 +327,11 @@ def get_informe_cev_v2_pagina2_as_dict(pdf_report: fitz.Document) -> Dict[str, A
         if not isinstance(pdf_report, fitz.Document): raise TypeError("Input must be a fitz.Document object.")
         if len(pdf_report) < 2: raise ValueError("PDF has less than 2 pages.")
         page = pdf_report[1]
+        read_area = _page_area_reader(page)
 
-        COORDINATES: Dict[str, Tuple[float, float, float, float]] = {
-            'region': (40.4,47.4,95.0,51.7), 'comuna': (40.4,53.2,95.0,57.4), 'direccion': (40.4,58.9,95.0,63.1), 'rol_vivienda': (40.4,64.6,95.0,68.9), 'tipo_vivienda': (40.4,70.2,95.0,74.4),
-            'zona_termica': (143.8,47.5,146.1,51.7), 'superficie_interior_util_m2_raw': (143.8,53.3,150,57.5), 'solicitado_por': (143.8,58.9,185.5,63.1), 'evaluado_por': (143.8,64.7,210.5,68.9), 'codigo_evaluacion': (143.8,70.2,160.6,74.5),
-            'demanda_calefaccion_kwh_m2_ano_raw': (99.4,99.6,107.6,105.2), 'demanda_enfriamiento_kwh_m2_ano_raw': (99.2,120.9,107.5,126.5), 'demanda_total_kwh_m2_ano_raw': (101.5,135.1,130.6,151.4),
-            'demanda_total_bis_kwh_m2_ano_raw': (39.2, 159.8, 122.8, 166.0), 'demanda_total_referencia_kwh_m2_ano_raw': (16.9, 168.3, 146.2, 173.2), 'porcentaje_ahorro_raw': (152.0, 162.6, 201.5, 168.7),
-            'muro_principal_descripcion': (46.2, 202.2, 184.5, 209.1), 'muro_principal_exigencia_raw': (185.5, 204.2, 209.5, 209.1),
-            'muro_secundario_descripcion': (46.2, 209.2, 184.5, 215.1), 'muro_secundario_exigencia_raw': (185.5,211.5,209.5,214.3),
-            'piso_principal_descripcion': (46.7,216.6,184.5,219.4), 'piso_principal_exigencia_raw': (185.5, 216.4, 209.5, 223.7),
-            'puerta_principal_descripcion': (46.2, 223.5, 184.5, 230.2), 'puerta_principal_exigencia_raw': (185.5, 223.9, 209.5, 230.2), # Textual
-            'techo_principal_descripcion': (46.2, 230.5, 184.5, 237.0), 'techo_principal_exigencia_raw': (185.5, 230.5, 209.5, 237.2),
-            'techo_secundario_descripcion': (46.2, 237.2, 184.5, 244.1), 'techo_secundario_exigencia_raw': (185.5, 237.2, 209.5, 244.1),
-            'superficie_vidriada_principal_descripcion': (46.2, 244.2, 184.5, 251.0), 'superficie_vidriada_principal_exigencia': (185.5, 244.3, 209.5, 251.0), # Textual
-            'superficie_vidriada_secundaria_descripcion': (46.2, 251.3, 184.5, 258.0), 'superficie_vidriada_secundaria_exigencia': (185.5, 251.3, 209.5, 258.0), # Textual
-            'ventilacion_rah_descripcion': (46.2, 258.3, 184.5, 265.0), 'ventilacion_rah_exigencia': (185.5, 258.3, 209.5, 265.0), # Textual
-            'infiltraciones_rah_descripcion': (46.2, 265.3, 184.5, 272.0), 'infiltraciones_rah_exigencia': (185.5, 265.3, 209.5, 272.0) # Textual
-        }
-
-        fields: Dict[str, str] = { k: extract_text_from_area(page, v) for k, v in COORDINATES.items() }
-
-        # Helper lambdas for cleaner processing
-        get_last_line = lambda key: fields.get(key, '').splitlines()[-1].strip() if fields.get(key) else None
-        get_last_line_float = lambda key: safe_float_convert(get_last_line(key))
-        clean_desc = lambda key: fields.get(key, '').replace('\n', ' ').strip()
-        clean_exigencia_float = lambda key: safe_float_convert(fields.get(key, '').replace('[W/m2K]', '').strip())
+        fields: Dict[str, str] = { k: read_area(area) for k, area in PAGINA2_COORDINATES }
 
-        result = {
-            'region': clean_desc('region'), 'comuna': clean_desc('comuna'), 'direccion': clean_desc('direccion'), 'rol_vivienda': clean_desc('rol_vivienda'), 'tipo_vivienda': clean_desc('tipo_vivienda'),
-            'zona_termica': clean_desc('zona_termica'), 'superficie_interior_util_m2': safe_float_convert(fields.get('superficie_interior_util_m2_raw')), 'solicitado_por': clean_desc('solicitado_por'), 'evaluado_por': clean_desc('evaluado_por'), 'codigo_evaluacion': clean_desc('codigo_evaluacion'),
-            'demanda_calefaccion_kwh_m2_ano': get_last_line_float('demanda_calefaccion_kwh_m2_ano_raw'), 'demanda_enfriamiento_kwh_m2_ano': get_last_line_float('demanda_enfriamiento_kwh_m2_ano_raw'), 'demanda_total_kwh_m2_ano': get_last_line_float('demanda_total_kwh_m2_ano_raw'),
-            'demanda_total_bis_kwh_m2_ano': get_last_line_float('demanda_total_bis_kwh_m2_ano_raw'), 'demanda_total_referencia_kwh_m2_ano': get_last_line_float('demanda_total_referencia_kwh_m2_ano_raw'), 'porcentaje_ahorro': get_last_line_float('porcentaje_ahorro_raw'),
-            'muro_principal_descripcion': clean_desc('muro_principal_descripcion'), 'muro_principal_exigencia_W_m2_K': clean_exigencia_float('muro_principal_exigencia_raw'),
-            'muro_secundario_descripcion': clean_desc('muro_secundario_descripcion'), 'muro_secundario_exigencia_W_m2_K': clean_exigencia_float('muro_secundario_exigencia_raw'),
-            'piso_principal_descripcion': clean_desc('piso_principal_descripcion'), 'piso_principal_exigencia_W_m2_K': clean_exigencia_float('piso_principal_exigencia_raw'),
-            'puerta_principal_descripcion': clean_desc('puerta_principal_descripcion'), 'puerta_principal_exigencia': clean_desc('puerta_principal_exigencia_raw'), # Textual
-            'techo_principal_descripcion': clean_desc('techo_principal_descripcion'), 'techo_principal_exigencia_W_m2_K': clean_exigencia_float('techo_principal_exigencia_raw'),
-            'techo_secundario_descripcion': clean_desc('techo_secundario_descripcion'), 'techo_secundario_exigencia_W_m2_K': clean_exigencia_float('techo_secundario_exigencia_raw'),
-            'superficie_vidriada_principal_descripcion': clean_desc('superficie_vidriada_principal_descripcion'), 'superficie_vidriada_principal_exigencia': clean_desc('superficie_vidriada_principal_exigencia'), # Textual
-            'superficie_vidriada_secundaria_descripcion': clean_desc('superficie_vidriada_secundaria_descripcion'), 'superficie_vidriada_secundaria_exigencia': clean_desc('superficie_vidriada_secundaria_exigencia'), # Textual
-            'ventilacion_rah_descripcion': clean_desc('ventilacion_rah_descripcion'), 'ventilacion_rah_exigencia': clean_desc('ventilacion_rah_exigencia'), # Textual
-            'infiltraciones_rah_descripcion': clean_desc('infiltraciones_rah_descripcion'), 'infiltraciones_rah_exigencia': clean_desc('infiltraciones_rah_exigencia') # Textual
-        }
+        result = { out_key: parse(fields[raw_key]) for out_key, raw_key, parse in PAGINA2_PARSERS }
         return result
 
     except (IndexError, ValueError, TypeError) as e:
@@ -269,7 +343,7 @@ def get_informe_cev_v2_pagina2_as_dataframe(pdf_report: fitz.Document) -> pd.Dat
     data_dict = get_informe_cev_v2_pagina2_as_dict(pdf_report)
     if not data_dict: return pd.DataFrame()
     try:
-        return pd.DataFrame.from_dict(data_dict, orient='index').T
+        return pd.DataFrame([data_dict])
     except Exception as e:
         logging.error(f"Failed to convert page 2 dict to DataFrame: {e}", exc_info=True)
         return pd.DataFrame()
@@ -279,82 +353,56 @@ def get_informe_cev_v2_pagina2_as_dataframe(pdf_report: fitz.Document) -> pd.Dat
 #  Pagina 3 - Consumos
 # ------------------------------------------------------------------------------------------------------------
 
-def get_informe_cev_v2_pagina3_consumos_as_dict(pdf_report: fitz.Document) -> Dict[str, Any]:
+# Page 3 consumption fields in output order: (output key, area in report mm (x1, y1, x2, y2), parser of the area's text)
+PAGINA3_CONSUMOS_FIELDS: Tuple[Tuple[str, Tuple[float, float, float, float], Callable[[str], Any]], ...] = (
+    ('codigo_evaluacion', (62.3, 30.7, 88.1, 35.1), _clean_desc),
+    ('agua_caliente_sanitaria_kwh_m2', (78.1, 73.9, 98.0, 76.7), safe_float_convert), ('agua_caliente_sanitaria_perc', (98.7, 73.9, 116.3, 76.7), safe_float_convert),
+    ('iluminacion_kwh_m2', (79.2, 78.1, 98.3, 81.4), safe_float_convert), ('iluminacion_per', (98.7, 78.1, 116.3, 81.4), safe_float_convert),
+    ('calefaccion_kwh_m2', (79.2, 82.2, 98.3, 86.6), safe_float_convert), ('calefaccion_kwh_per', (98.7, 82.2, 116.3, 86.6), safe_float_convert),
+    ('energia_renovable_no_convencional_kwh_m2', (79.2, 87.2, 98.3, 91.0), safe_float_convert), ('energia_renovable_no_convencional_per', (98.7, 87.2, 116.3, 91.0), safe_float_convert),
+    ('consumo_total_kwh_m2', (118.0, 74.0, 148.0, 86.0), safe_float_convert), ('emisiones_kgco2_m2_ano', (171.5, 69.0, 183.5, 74.2), safe_float_convert),
+    ('calefaccion_descripcion_proy', (76.6, 101.4, 155.5, 105.3), _clean_desc), ('calefaccion_consumo_proy_kwh', (157.0, 101.4, 196.0, 105.3), _last_line_float), ('calefaccion_consumo_proy_per', (198.0, 101.4, 207.0, 105.3), _last_line_float),
+    ('iluminacion_descripcion_proy', (76.6, 106.2, 155.5, 110.0), _clean_desc), ('iluminacion_consumo_proy_kwh', (157.0, 106.2, 196.0, 110.0), _last_line_float), ('iluminacion_consumo_proy_per', (198.0, 106.2, 207.0, 110.0), _last_line_float),
+    ('agua_caliente_sanitaria_descripcion_proy', (76.6, 111.2, 155.5, 115.0), _clean_desc), ('agua_caliente_sanitaria_consumo_proy_kwh', (157.0, 111.2, 196.0, 115.0), _last_line_float), ('agua_caliente_sanitaria_consumo_proy_per', (198.0, 111.2, 207.0, 115.0), _last_line_float),
+    ('energia_renovable_no_convencional_descripcion_proy', (76.6, 115.8, 155.5, 120.0), _clean_desc), ('energia_renovable_no_convencional_consumo_proy_kwh', (157.0, 115.8, 196.0, 120.0), _last_line_float), ('energia_renovable_no_convencional_consumo_proy_per', (198.0, 115.8, 207.0, 120.0), _last_line_float),
+    ('consumo_total_requerido_proy_kwh', (157.0, 121.0, 196.0, 125.0), _last_line_float),
+    ('calefaccion_descripcion_ref', (76.6, 136.1, 155.5, 140.1), _clean_desc), ('calefaccion_consumo_ref_kwh', (157.0, 136.1, 196.0, 140.1), _last_line_float), ('calefaccion_consumo_ref_per', (198.0, 136.1, 207.0, 140.1), _last_line_float),
+    ('iluminacion_descripcion_ref', (76.6, 140.7, 155.5, 144.7), _clean_desc), ('iluminacion_consumo_ref_kwh', (157.0, 140.7, 196.0, 144.7), _last_line_float), ('iluminacion_consumo_ref_per', (198.0, 140.7, 207.0, 144.7), _last_line_float),
+    ('agua_caliente_sanitaria_descripcion_ref', (76.6, 145.2, 155.5, 149.2), _clean_desc), ('agua_caliente_sanitaria_consumo_ref_kwh', (157.0, 145.2, 196.0, 149.2), _last_line_float), ('agua_caliente_sanitaria_consumo_ref_per', (198.0, 145.2, 207.0, 149.2), _last_line_float),
+    ('energia_renovable_no_convencional_descripcion_ref', (76.6, 150.8, 155.5, 154.8), _clean_desc), ('energia_renovable_no_convencional_consumo_ref_kwh', (157.0, 150.8, 196.0, 154.8), _last_line_float), ('energia_renovable_no_convencional_consumo_ref_per', (198.0, 150.8, 207.0, 154.8), _last_line_float),
+    ('consumo_total_requerido_ref_kwh', (157.0, 156.0, 196.0, 160.0), _last_line_float),
+    ('consumo_ep_calefaccion_kwh', (87.0, 176.0, 104.0, 179.0), safe_float_convert), ('consumo_ep_agua_caliente_sanitaria_kwh', (87.0, 180.0, 104.0, 183.5), safe_float_convert), ('consumo_ep_iluminacion_kwh', (87.0, 184.0, 104.0, 187.5), safe_float_convert), ('consumo_ep_ventiladores_kwh', (87.0, 188.0, 104.0, 191.5), safe_float_convert),
+    ('generacion_ep_fotovoltaicos_kwh', (87.0, 199.0, 104.0, 202.5), safe_float_convert), ('aporte_fotovoltaicos_consumos_basicos_kwh', (87.0, 203.2, 104.0, 206.0), safe_float_convert), ('diferencia_fotovoltaica_para_consumo_kwh', (87.0, 206.9, 104.0, 210.2), safe_float_convert),
+    ('aporte_solar_termica_consumos_basicos_kwh', (87.0, 218.0, 104.0, 221.0), safe_float_convert), ('aporte_solar_termica_agua_caliente_sanitaria_kwh', (87.0, 222.5, 104.0, 225.5), safe_float_convert),
+    ('total_consumo_ep_antes_fotovoltaica_kwh', (192.0, 176.0, 208.0, 179.5), safe_float_convert), ('aporte_fotovoltaicos_consumos_basicos_kwh_bis', (192.0, 180.0, 208.0, 183.5), safe_float_convert), ('consumos_basicos_a_suplir_kwh', (192.0, 184.3, 208.0, 187.0), safe_float_convert),
+    ('consumo_total_ep_obj_kwh', (192.0, 199.0, 208.0, 202.5), safe_float_convert), ('consumo_total_ep_ref_kwh', (192.0, 202.8, 208.0, 206.5), safe_float_convert), ('coeficiente_energetico_c', (192.0, 207.0, 208.0, 210.5), safe_float_convert),
+)
+
+def get_informe_cev_v2_pagina3_consumos_as_dict(pdf_report: fitz.Document, text_lines: Optional[List[TextLine]] = None) -> Dict[str, Any]:
     """
     Extract data from page 3 (consumos) of an informe_CEV_v2 PDF report and return it as a dictionary.
-    Uses safe float conversion.
+    Uses safe float conversion. text_lines: page 3's get_page_text_lines index, when already built for the envelope table.
     """
     result: Dict[str, Any] = {}
     try:
         if not isinstance(pdf_report, fitz.Document): raise TypeError("Input must be a fitz.Document object.")
         if len(pdf_report) < 3: raise ValueError("PDF has less than 3 pages.")
         page = pdf_report[2]
+        read_area = _page_area_reader(page, text_lines)
 
-        COORDINATES: Dict[str, Tuple[float, float, float, float]] = {
-            'codigo_evaluacion': (62.3, 30.7, 88.1, 35.1),
-            'agua_caliente_sanitaria_kwh_m2_raw': (78.1, 73.9, 98.0, 76.7), 'agua_caliente_sanitaria_perc_raw': (98.7, 73.9, 116.3, 76.7),
-            'iluminacion_kwh_m2_raw': (79.2, 78.1, 98.3, 81.4), 'iluminacion_per_raw': (98.7, 78.1, 116.3, 81.4),
-            'calefaccion_kwh_m2_raw': (79.2, 82.2, 98.3, 86.6), 'calefaccion_kwh_per_raw': (98.7, 82.2, 116.3, 86.6),
-            'energia_renovable_no_convencional_kwh_m2_raw': (79.2, 87.2, 98.3, 91.0), 'energia_renovable_no_convencional_per_raw': (98.7, 87.2, 116.3, 91.0),
-            'consumo_total_kwh_m2_raw': (118.0, 74.0, 148.0, 86.0), 'emisiones_kgco2_m2_ano_raw': (171.5, 69.0, 183.5, 74.2),
-            'calefaccion_descripcion_proy': (76.6, 101.4, 155.5, 105.3), 'calefaccion_consumo_proy_kwh_raw': (157.0, 101.4, 196.0, 105.3), 'calefaccion_consumo_proy_per_raw': (198.0, 101.4, 207.0, 105.3),
-            'iluminacion_descripcion_proy': (76.6, 106.2, 155.5, 110.0), 'iluminacion_consumo_proy_kwh_raw': (157.0, 106.2, 196.0, 110.0), 'iluminacion_consumo_proy_per_raw': (198.0, 106.2, 207.0, 110.0),
-            'agua_caliente_sanitaria_descripcion_proy': (76.6, 111.2, 155.5, 115.0), 'agua_caliente_sanitaria_consumo_proy_kwh_raw': (157.0, 111.2, 196.0, 115.0), 'agua_caliente_sanitaria_consumo_proy_per_raw': (198.0, 111.2, 207.0, 115.0),
-            'energia_renovable_no_convencional_descripcion_proy': (76.6, 115.8, 155.5, 120.0), 'energia_renovable_no_convencional_consumo_proy_kwh_raw': (157.0, 115.8, 196.0, 120.0), 'energia_renovable_no_convencional_consumo_proy_per_raw': (198.0, 115.8, 207.0, 120.0),
-            'consumo_total_requerido_proy_kwh_raw': (157.0, 121.0, 196.0, 125.0),
-            'calefaccion_descripcion_ref': (76.6, 136.1, 155.5, 140.1), 'calefaccion_consumo_ref_kwh_raw': (157.0, 136.1, 196.0, 140.1), 'calefaccion_consumo_ref_per_raw': (198.0, 136.1, 207.0, 140.1),
-            'iluminacion_descripcion_ref': (76.6, 140.7, 155.5, 144.7), 'iluminacion_consumo_ref_kwh_raw': (157.0, 140.7, 196.0, 144.7), 'iluminacion_consumo_ref_per_raw': (198.0, 140.7, 207.0, 144.7),
-            'agua_caliente_sanitaria_descripcion_ref': (76.6, 145.2, 155.5, 149.2), 'agua_caliente_sanitaria_consumo_ref_kwh_raw': (157.0, 145.2, 196.0, 149.2), 'agua_caliente_sanitaria_consumo_ref_per_raw': (198.0, 145.2, 207.0, 149.2),
-            'energia_renovable_no_convencional_descripcion_ref': (76.6, 150.8, 155.5, 154.8), 'energia_renovable_no_convencional_consumo_ref_kwh_raw': (157.0, 150.8, 196.0, 154.8), 'energia_renovable_no_convencional_consumo_ref_per_raw': (198.0, 150.8, 207.0, 154.8),
-            'consumo_total_requerido_ref_kwh_raw': (157.0, 156.0, 196.0, 160.0),
-            'consumo_ep_calefaccion_kwh_raw': (87.0, 176.0, 104.0, 179.0), 'consumo_ep_agua_caliente_sanitaria_kwh_raw': (87.0, 180.0, 104.0, 183.5), 'consumo_ep_iluminacion_kwh_raw': (87.0, 184.0, 104.0, 187.5), 'consumo_ep_ventiladores_kwh_raw': (87.0, 188.0, 104.0, 191.5),
-            'generacion_ep_fotovoltaicos_kwh_raw': (87.0, 199.0, 104.0, 202.5), 'aporte_fotovoltaicos_consumos_basicos_kwh_raw': (87.0, 203.2, 104.0, 206.0), 'diferencia_fotovoltaica_para_consumo_kwh_raw': (87.0, 206.9, 104.0, 210.2),
-            'aporte_solar_termica_consumos_basicos_kwh_raw': (87.0, 218.0, 104.0, 221.0), 'aporte_solar_termica_agua_caliente_sanitaria_kwh_raw': (87.0, 222.5, 104.0, 225.5),
-            'total_consumo_ep_antes_fotovoltaica_kwh_raw': (192.0, 176.0, 208.0, 179.5), 'aporte_fotovoltaicos_consumos_basicos_kwh_bis_raw': (192.0, 180.0, 208.0, 183.5), 'consumos_basicos_a_suplir_kwh_raw': (192.0, 184.3, 208.0, 187.0),
-            'consumo_total_ep_obj_kwh_raw': (192.0, 199.0, 208.0, 202.5), 'consumo_total_ep_ref_kwh_raw': (192.0, 202.8, 208.0, 206.5), 'coeficiente_energetico_c_raw': (192.0, 207.0, 208.0, 210.5)
-        }
-
-        fields: Dict[str, str] = { k: extract_text_from_area(page, v) for k, v in COORDINATES.items() }
-
-        get_float = lambda key: safe_float_convert(fields.get(key))
-        get_last_line_float = lambda key: safe_float_convert(fields.get(key, '').splitlines()[-1] if fields.get(key) else None)
-        clean_desc = lambda key: fields.get(key, '').replace('\n', ' ').strip()
-
-        result = {
-            'codigo_evaluacion': clean_desc('codigo_evaluacion'),
-            'agua_caliente_sanitaria_kwh_m2': get_float('agua_caliente_sanitaria_kwh_m2_raw'), 'agua_caliente_sanitaria_perc': get_float('agua_caliente_sanitaria_perc_raw'),
-            'iluminacion_kwh_m2': get_float('iluminacion_kwh_m2_raw'), 'iluminacion_per': get_float('iluminacion_per_raw'),
-            'calefaccion_kwh_m2': get_float('calefaccion_kwh_m2_raw'), 'calefaccion_kwh_per': get_float('calefaccion_kwh_per_raw'),
-            'energia_renovable_no_convencional_kwh_m2': get_float('energia_renovable_no_convencional_kwh_m2_raw'), 'energia_renovable_no_convencional_per': get_float('energia_renovable_no_convencional_per_raw'),
-            'consumo_total_kwh_m2': get_float('consumo_total_kwh_m2_raw'), 'emisiones_kgco2_m2_ano': get_float('emisiones_kgco2_m2_ano_raw'),
-            'calefaccion_descripcion_proy': clean_desc('calefaccion_descripcion_proy'), 'calefaccion_consumo_proy_kwh': get_last_line_float('calefaccion_consumo_proy_kwh_raw'), 'calefaccion_consumo_proy_per': get_last_line_float('calefaccion_consumo_proy_per_raw'),
-            'iluminacion_descripcion_proy': clean_desc('iluminacion_descripcion_proy'), 'iluminacion_consumo_proy_kwh': get_last_line_float('iluminacion_consumo_proy_kwh_raw'), 'iluminacion_consumo_proy_per': get_last_line_float('iluminacion_consumo_proy_per_raw'),
-            'agua_caliente_sanitaria_descripcion_proy': clean_desc('agua_caliente_sanitaria_descripcion_proy'), 'agua_caliente_sanitaria_consumo_proy_kwh': get_last_line_float('agua_caliente_sanitaria_consumo_proy_kwh_raw'), 'agua_caliente_sanitaria_consumo_proy_per': get_last_line_float('agua_caliente_sanitaria_consumo_proy_per_raw'),
-            'energia_renovable_no_convencional_descripcion_proy': clean_desc('energia_renovable_no_convencional_descripcion_proy'), 'energia_renovable_no_convencional_consumo_proy_kwh': get_last_line_float('energia_renovable_no_convencional_consumo_proy_kwh_raw'), 'energia_renovable_no_convencional_consumo_proy_per': get_last_line_float('energia_renovable_no_convencional_consumo_proy_per_raw'),
-            'consumo_total_requerido_proy_kwh': get_last_line_float('consumo_total_requerido_proy_kwh_raw'),
-            'calefaccion_descripcion_ref': clean_desc('calefaccion_descripcion_ref'), 'calefaccion_consumo_ref_kwh': get_last_line_float('calefaccion_consumo_ref_kwh_raw'), 'calefaccion_consumo_ref_per': get_last_line_float('calefaccion_consumo_ref_per_raw'),
-            'iluminacion_descripcion_ref': clean_desc('iluminacion_descripcion_ref'), 'iluminacion_consumo_ref_kwh': get_last_line_float('iluminacion_consumo_ref_kwh_raw'), 'iluminacion_consumo_ref_per': get_last_line_float('iluminacion_consumo_ref_per_raw'),
-            'agua_caliente_sanitaria_descripcion_ref': clean_desc('agua_caliente_sanitaria_descripcion_ref'), 'agua_caliente_sanitaria_consumo_ref_kwh': get_last_line_float('agua_caliente_sanitaria_consumo_ref_kwh_raw'), 'agua_caliente_sanitaria_consumo_ref_per': get_last_line_float('agua_caliente_sanitaria_consumo_ref_per_raw'),
-            'energia_renovable_no_convencional_descripcion_ref': clean_desc('energia_renovable_no_convencional_descripcion_ref'), 'energia_renovable_no_convencional_consumo_ref_kwh': get_last_line_float('energia_renovable_no_convencional_consumo_ref_kwh_raw'), 'energia_renovable_no_convencional_consumo_ref_per': get_last_line_float('energia_renovable_no_convencional_consumo_ref_per_raw'),
-            'consumo_total_requerido_ref_kwh': get_last_line_float('consumo_total_requerido_ref_kwh_raw'),
-            'consumo_ep_calefaccion_kwh': get_float('consumo_ep_calefaccion_kwh_raw'), 'consumo_ep_agua_caliente_sanitaria_kwh': get_float('consumo_ep_agua_caliente_sanitaria_kwh_raw'), 'consumo_ep_iluminacion_kwh': get_float('consumo_ep_iluminacion_kwh_raw'), 'consumo_ep_ventiladores_kwh': get_float('consumo_ep_ventiladores_kwh_raw'),
-            'generacion_ep_fotovoltaicos_kwh': get_float('generacion_ep_fotovoltaicos_kwh_raw'), 'aporte_fotovoltaicos_consumos_basicos_kwh': get_float('aporte_fotovoltaicos_consumos_basicos_kwh_raw'), 'diferencia_fotovoltaica_para_consumo_kwh': get_float('diferencia_fotovoltaica_para_consumo_kwh_raw'),
-            'aporte_solar_termica_consumos_basicos_kwh': get_float('aporte_solar_termica_consumos_basicos_kwh_raw'), 'aporte_solar_termica_agua_caliente_sanitaria_kwh': get_float('aporte_solar_termica_agua_caliente_sanitaria_kwh_raw'),
-            'total_consumo_ep_antes_fotovoltaica_kwh': get_float('total_consumo_ep_antes_fotovoltaica_kwh_raw'), 'aporte_fotovoltaicos_consumos_basicos_kwh_bis': get_float('aporte_fotovoltaicos_consumos_basicos_kwh_bis_raw'), 'consumos_basicos_a_suplir_kwh': get_float('consumos_basicos_a_suplir_kwh_raw'),
-            'consumo_total_ep_obj_kwh': get_float('consumo_total_ep_obj_kwh_raw'), 'consumo_total_ep_ref_kwh': get_float('consumo_total_ep_ref_kwh_raw'), 'coeficiente_energetico_c': get_float('coeficiente_energetico_c_raw')
-        }
+        result = { k: parse(read_area(area)) for k, area, parse in PAGINA3_CONSUMOS_FIELDS }
         return result
 
     except (IndexError, ValueError, TypeError) as e:
         logging.error(f"Error processing Page 3 (Consumos) dictionary: {e}", exc_info=True)
         return {}
 
-def get_informe_cev_v2_pagina3_consumos_as_dataframe(pdf_report: fitz.Document) -> pd.DataFrame:
+def get_informe_cev_v2_pagina3_consumos_as_dataframe(pdf_report: fitz.Document, text_lines: Optional[List[TextLine]] = None) -> pd.DataFrame:
     """Extracts consumption data from page 3 into a Pandas DataFrame."""
-    data_dict = get_informe_cev_v2_pagina3_consumos_as_dict(pdf_report)
+    data_dict = get_informe_cev_v2_pagina3_consumos_as_dict(pdf_report, text_lines)
     if not data_dict: return pd.DataFrame()
     try:
-        return pd.DataFrame.from_dict(data_dict, orient='index').T
+        return pd.DataFrame([data_dict])
     except Exception as e:
         logging.error(f"Failed to convert page 3 consumos dict to DataFrame: {e}", exc_info=True)
         return pd.DataFrame()
@@ -364,56 +412,56 @@ def get_informe_cev_v2_pagina3_consumos_as_dataframe(pdf_report: fitz.Document)
 #  Pagina 3 - Envolvente
 # ------------------------------------------------------------------------------------------------------------
 
-def get_informe_cev_v2_pagina3_envolvente_as_dict(pdf_report: fitz.Document) -> Dict[str, Any]:
+# Envelope table layout in report mm: one row per orientation
+PAGINA3_ORIENTATIONS = ('Horiz', 'N', 'NE', 'E', 'SE', 'S', 'SO', 'O', 'NO', 'Pisos')
+PAGINA3_NUM_ORIENTATIONS = len(PAGINA3_ORIENTATIONS)
+PAGINA3_ENVOLVENTE_DY = 4.2 # Row pitch
+
+PAGINA3_ENVOLVENTE_BLOCKS: Dict[str, Tuple[float, float, float, float]] = {
+    'codigo_eval_coords': (62.3, 30.7, 88.1, 35.1),
+    'opacos_area_coords': (19.5, 245.0, 47.0, 245.0 + (PAGINA3_NUM_ORIENTATIONS * PAGINA3_ENVOLVENTE_DY)),
+    'opacos_U_coords': (47.8, 245.0, 60.5, 245.0 + (PAGINA3_NUM_ORIENTATIONS * PAGINA3_ENVOLVENTE_DY)),
+    'traslucidos_area_coords': (68.2, 245.0, 89.5, 245.0 + ((PAGINA3_NUM_ORIENTATIONS -1) * PAGINA3_ENVOLVENTE_DY)),
+    'traslucidos_U_coords': (90.4, 245.0, 103.1, 245.0 + ((PAGINA3_NUM_ORIENTATIONS -1) * PAGINA3_ENVOLVENTE_DY)),
+    'ua_phiL_coords': (190.5, 245.5, 201.0, 245.5 + (PAGINA3_NUM_ORIENTATIONS * PAGINA3_ENVOLVENTE_DY))
+}
+
+# Thermal bridges: (key, one 3.5 mm high cell per row), 8 rows from y = 250 between the first and last orientation
+PAGINA3_PUENTES_TERMICOS_CELLS: Tuple[Tuple[str, Tuple[Tuple[float, float, float, float], ...]], ...] = tuple(
+    (key, tuple((x1, 250.0 + i * PAGINA3_ENVOLVENTE_DY, x2, 250.0 + i * PAGINA3_ENVOLVENTE_DY + 3.5) for i in range(8)))
+    for key, (x1, x2) in (
+        ('P01_W_K', (115.5, 124.5)), ('P02_W_K', (126.2, 136.9)), ('P03_W_K', (139.0, 148.2)),
+        ('P04_W_K', (149.0, 160.0)), ('P05_W_K', (161.3, 171.2))
+    )
+)
+
+def get_informe_cev_v2_pagina3_envolvente_as_dict(pdf_report: fitz.Document, text_lines: Optional[List[TextLine]] = None) -> Dict[str, Any]:
     """
     Extracts envelope data from page 3 into a dictionary (structured for DataFrame).
-    Uses safe float conversion.
+    Uses safe float conversion. text_lines: page 3's get_page_text_lines index, when already built for the consumption table.
     """
     data_list: Dict[str, List[Any]] = {}
     try:
         if not isinstance(pdf_report, fitz.Document): raise TypeError("Input must be a fitz.Document object.")
         if len(pdf_report) < 3: raise ValueError("PDF has less than 3 pages.")
         page = pdf_report[2]
+        read_area = _page_area_reader(page, text_lines)
 
-        dy = 4.2; num_orientations = 10; num_puentes_termicos = 8; puente_termico_start_y = 250.0
-        orientations = ['Horiz', 'N', 'NE', 'E', 'SE', 'S', 'SO', 'O', 'NO', 'Pisos']
-
-        COORDINATES_BLOCKS: Dict[str, Tuple[float, float, float, float]] = {
-            'codigo_eval_coords': (62.3, 30.7, 88.1, 35.1),
-            'opacos_area_coords': (19.5, 245.0, 47.0, 245.0 + (num_orientations * dy)),
-            'opacos_U_coords': (47.8, 245.0, 60.5, 245.0 + (num_orientations * dy)),
-            'traslucidos_area_coords': (68.2, 245.0, 89.5, 245.0 + ((num_orientations -1) * dy)),
-            'traslucidos_U_coords': (90.4, 245.0, 103.1, 245.0 + ((num_orientations -1) * dy)),
-            'ua_phiL_coords': (190.5, 245.5, 201.0, 245.5 + (num_orientations * dy))
-        }
-
-        PT_COORDS_BASE: Dict[str, Tuple[float, float]] = {
-            'P01_W_K': (115.5, 124.5), 'P02_W_K': (126.2, 136.9), 'P03_W_K': (139.0, 148.2),
-            'P04_W_K': (149.0, 160.0), 'P05_W_K': (161.3, 171.2)
-        }
+        num_orientations = PAGINA3_NUM_ORIENTATIONS
 
         # --- Extract Single Value ---
-        codigo_evaluacion = extract_text_from_area(page, COORDINATES_BLOCKS['codigo_eval_coords']).strip()
+        codigo_evaluacion = read_area(PAGINA3_ENVOLVENTE_BLOCKS['codigo_eval_coords']).strip()
 
         # --- Extract Columnar Data Blocks ---
-        opacos_area_text = extract_text_from_area(page, COORDINATES_BLOCKS['opacos_area_coords'])
-        opacos_U_text = extract_text_from_area(page, COORDINATES_BLOCKS['opacos_U_coords'])
-        traslucidos_area_text = extract_text_from_area(page, COORDINATES_BLOCKS['traslucidos_area_coords'])
-        traslucidos_U_text = extract_text_from_area(page, COORDINATES_BLOCKS['traslucidos_U_coords'])
-        ua_phiL_text = extract_text_from_area(page, COORDINATES_BLOCKS['ua_phiL_coords'])
-
-        # --- Extract Puente Termico Data ---
-        puentes_termicos_text: Dict[str, List[str]] = {key: [] for key in PT_COORDS_BASE}
-        for key, (x1, x2) in PT_COORDS_BASE.items():
-            for i in range(num_puentes_termicos):
-                y1 = puente_termico_start_y + i * dy; y2 = y1 + 3.5
-                pt_coord = (x1, y1, x2, y2)
-                text_lines = extract_text_from_area(page, pt_coord).splitlines()
-                puentes_termicos_text[key].append(text_lines[-1] if text_lines else '')
+        opacos_area_text = read_area(PAGINA3_ENVOLVENTE_BLOCKS['opacos_area_coords'])
+        opacos_U_text = read_area(PAGINA3_ENVOLVENTE_BLOCKS['opacos_U_coords'])
+        traslucidos_area_text = read_area(PAGINA3_ENVOLVENTE_BLOCKS['traslucidos_area_coords'])
+        traslucidos_U_text = read_area(PAGINA3_ENVOLVENTE_BLOCKS['traslucidos_U_coords'])
+        ua_phiL_text = read_area(PAGINA3_ENVOLVENTE_BLOCKS['ua_phiL_coords'])
 
         # --- Process and Structure Data ---
         data_list['codigo_evaluacion'] = [codigo_evaluacion] * num_orientations
-        data_list['orientacion'] = orientations
+        data_list['orientacion'] = list(PAGINA3_ORIENTATIONS)
 
         opacos_area_lines = opacos_area_text.splitlines()[-num_orientations:]
         opacos_U_lines = opacos_U_text.splitlines()[-num_orientations:]
@@ -425,8 +473,9 @@ def get_informe_cev_v2_pagina3_envolvente_as_dict(pdf_report: fitz.Document) ->
         data_list['elementos_traslucidos_area_m2'] = [safe_float_convert(line) for line in traslucidos_area_lines] + [None]
         data_list['elementos_traslucidos_U_W_m2_K'] = [safe_float_convert(line) for line in traslucidos_U_lines] + [None]
 
-        for key, lines in puentes_termicos_text.items():
-            float_values = [safe_float_convert(line) for line in lines]
+        # Puente termico cells: each value is the last line of its cell, read and parsed in one step
+        for key, cells in PAGINA3_PUENTES_TERMICOS_CELLS:
+            float_values = [_last_line_float(read_area(cell)) for cell in cells]
             data_list[key] = [None] + float_values + [None] # Pad first and last
 
         ua_phiL_lines = ua_phiL_text.splitlines()[-num_orientations:]
@@ -444,17 +493,13 @@ def get_informe_cev_v2_pagina3_envolvente_as_dict(pdf_report: fitz.Document) ->
         logging.error(f"Error processing Page 3 (Envolvente) dictionary: {e}", exc_info=True)
         return {}
 
-def get_informe_cev_v2_pagina3_envolvente_as_dataframe(pdf_report: fitz.Document) -> pd.DataFrame:
+def get_informe_cev_v2_pagina3_envolvente_as_dataframe(pdf_report: fitz.Document, text_lines: Optional[List[TextLine]] = None) -> pd.DataFrame:
     """Extracts envelope data from page 3 into a Pandas DataFrame."""
-    data_dict_of_lists = get_informe_cev_v2_pagina3_envolvente_as_dict(pdf_report)
+    data_dict_of_lists = get_informe_cev_v2_pagina3_envolvente_as_dict(pdf_report, text_lines)
     if not data_dict_of_lists: return pd.DataFrame()
     try:
-        # Directly create DataFrame from the dictionary of lists
-        df = pd.DataFrame(data_dict_of_lists)
-        # Drop the duplicated codigo_evaluacion column generated during dict creation if exists
-        if "codigo_evaluacion" in df.columns:
-            df = df.drop(columns=["codigo_evaluacion"])
-        return df
+        # One construction from the column lists, leaving out the repeated codigo_evaluacion instead of dropping it afterwards
+        return pd.DataFrame({k: v for k, v in data_dict_of_lists.items() if k != "codigo_evaluacion"})
     except ValueError as ve:
          logging.error(f"ValueError creating DataFrame for Page 3 Envolvente (likely unequal list lengths): {ve}", exc_info=True)
          return pd.DataFrame()
@@ -467,6 +512,18 @@ def get_informe_cev_v2_pagina3_envolvente_as_dataframe(pdf_report: fitz.Document
 #  Pagina 4
 # ------------------------------------------------------------------------------------------------------------
 
+# Page 4 monthly rows: (key, (y1, y2)) in report mm; each row has one cell per month
+PAGINA4_MONTHLY_ROWS: Tuple[Tuple[str, Tuple[float, float]], ...] = (
+    ('demanda_calef_viv_eval_kwh', (139.5, 143.5)), ('demanda_calef_viv_ref_kwh', (144.1, 147.8)),
+    ('demanda_enfri_viv_eval_kwh', (161.4, 165.4)), ('demanda_enfri_viv_ref_kwh', (166.0, 168.8)),
+    ('sobrecalentamiento_viv_eval_hr', (254.9, 258.6)), ('sobrecalentamiento_viv_ref_hr', (259.6, 263.1)),
+    ('sobreenfriamiento_viv_eval_hr', (275.0, 278.6)), ('sobreenfriamiento_viv_ref_hr', (279.4, 283.1)),
+)
+PAGINA4_CODIGO_EVAL_COORDS = (62.3, 30.7, 88.1, 36.1)
+PAGINA4_NUM_MONTHS = 12
+# Column span (x1, x2) of each month: 11.5 mm wide, 13.5 mm apart from x = 42
+PAGINA4_MONTH_X: Tuple[Tuple[float, float], ...] = tuple((42.0 + i * 13.5, 42.0 + i * 13.5 + 11.5) for i in range(PAGINA4_NUM_MONTHS))
+
 def get_informe_cev_v2_pagina4_as_dict(pdf_report: fitz.Document) -> Dict[str, Any]:
     """
     Extracts monthly data from page 4 into a dictionary (structured for DataFrame).
@@ -477,30 +534,15 @@ def get_informe_cev_v2_pagina4_as_dict(pdf_report: fitz.Document) -> Dict[str, A
         if not isinstance(pdf_report, fitz.Document): raise TypeError("Input must be a fitz.Document object.")
         if len(pdf_report) < 4: raise ValueError("PDF has less than 4 pages.")
         page = pdf_report[3]
-        num_months = 12; months = list(range(1, num_months + 1))
+        read_area = _page_area_reader(page)
+        num_months = PAGINA4_NUM_MONTHS
 
-        codigo_eval_coords = (62.3, 30.7, 88.1, 36.1)
-        dx = 13.5; base_x = 42.0; col_width = 11.5
-
-        Y_COORDS: Dict[str, Tuple[float, float]] = {
-            'demanda_calef_viv_eval_kwh': (139.5, 143.5), 'demanda_calef_viv_ref_kwh': (144.1, 147.8),
-            'demanda_enfri_viv_eval_kwh': (161.4, 165.4), 'demanda_enfri_viv_ref_kwh': (166.0, 168.8),
-            'sobrecalentamiento_viv_eval_hr': (254.9, 258.6), 'sobrecalentamiento_viv_ref_hr': (259.6, 263.1),
-            'sobreenfriamiento_viv_eval_hr': (275.0, 278.6), 'sobreenfriamiento_viv_ref_hr': (279.4, 283.1)
-        }
-
-        codigo_evaluacion = extract_text_from_area(page, codigo_eval_coords).strip()
+        codigo_evaluacion = read_area(PAGINA4_CODIGO_EVAL_COORDS).strip()
         data_list['codigo_evaluacion'] = [codigo_evaluacion] * num_months
-        data_list['mes_id'] = months
+        data_list['mes_id'] = list(range(1, num_months + 1))
 
-        for key, (y1, y2) in Y_COORDS.items():
-            monthly_values_text: List[str] = []
-            for i in range(num_months):
-                x1 = base_x + i * dx; x2 = x1 + col_width
-                month_coord = (x1, y1, x2, y2)
-                text = extract_text_from_area(page, month_coord)
-                monthly_values_text.append(text)
-            data_list[key] = [safe_float_convert(val) for val in monthly_values_text]
+        for key, (y1, y2) in PAGINA4_MONTHLY_ROWS:
+            data_list[key] = [safe_float_convert(read_area((x1, y1, x2, y2))) for x1, x2 in PAGINA4_MONTH_X]
 
         # Validate list lengths
         for key, lst in data_list.items():
@@ -552,7 +594,7 @@ def get_informe_cev_v2_pagina5_as_dict(pdf_report: fitz.Document) -> Dict[str, A
         if len(pdf_report) < 5: raise ValueError("PDF has less than 5 pages.")
         page = pdf_report[4]
         codigo_eval_coords = (62.3, 30.7, 88.1, 35.1) # Standard coord
-        codigo_evaluacion = extract_text_from_area(page, codigo_eval_coords).strip()
+        codigo_evaluacion = _page_area_reader(page)(codigo_eval_coords)
         result = {
             'codigo_evaluacion': codigo_evaluacion,
             'content_note': 'Extracción de datos específicos para Página 5 no implementada (contenido gráfico).'
@@ -584,7 +626,7 @@ def get_informe_cev_v2_pagina6_as_dict(pdf_report: fitz.Document) -> Dict[str, A
         if len(pdf_report) < 6: raise ValueError("PDF has less than 6 pages.")
         page = pdf_report[5]
         codigo_eval_coords = (62.3, 30.7, 88.1, 35.1) # Standard coord
-        codigo_evaluacion = extract_text_from_area(page, codigo_eval_coords).strip()
+        codigo_evaluacion = _page_area_reader(page)(codigo_eval_coords)
         result = {
             'codigo_evaluacion': codigo_evaluacion,
             'content_note': 'Extracción de datos específicos para Página 6 no implementada (contenido gráfico).'
@@ -608,6 +650,13 @@ def get_informe_cev_v2_pagina6_as_dataframe(pdf_report: fitz.Document) -> pd.Dat
 #  Pagina 7
 # ------------------------------------------------------------------------------------------------------------
 
+# Page 7 field areas in report mm, (key, (x1, y1, x2, y2)), in output order
+PAGINA7_COORDINATES: Tuple[Tuple[str, Tuple[float, float, float, float]], ...] = (
+    ('codigo_evaluacion', (63.5, 30.9, 84.0, 36.1)), ('mandante_nombre', (27.5, 90.6, 96.0, 94.7)),
+    ('mandante_rut', (27.5, 95.4, 96.0, 99.4)), ('evaluador_nombre', (131.1, 90.6, 205.0, 94.7)),
+    ('evaluador_rut', (131.1, 95.4, 196.7, 99.4)), ('evaluador_rol_minvu', (150.0, 99.9, 166.0, 103.7)),
+)
+
 def get_informe_cev_v2_pagina7_as_dict(pdf_report: fitz.Document) -> Dict[str, Any]:
     """
     Extract data from page 7 of an informe_CEV_v2 PDF report and return it as a dictionary.
@@ -617,23 +666,10 @@ def get_informe_cev_v2_pagina7_as_dict(pdf_report: fitz.Document) -> Dict[str, A
         if not isinstance(pdf_report, fitz.Document): raise TypeError("Input must be a fitz.Document object.")
         if len(pdf_report) < 7: raise ValueError("PDF has less than 7 pages.")
         page = pdf_report[6]
+        read_area = _page_area_reader(page)
 
-        COORDINATES: Dict[str, Tuple[float, float, float, float]] = {
-            'codigo_evaluacion': (63.5, 30.9, 84.0, 36.1), 'mandante_nombre': (27.5, 90.6, 96.0, 94.7),
-            'mandante_rut': (27.5, 95.4, 96.0, 99.4), 'evaluador_nombre': (131.1, 90.6, 205.0, 94.7),
-            'evaluador_rut': (131.1, 95.4, 196.7, 99.4), 'evaluador_rol_minvu': (150.0, 99.9, 166.0, 103.7)
-        }
-
-        fields: Dict[str, str] = { k: extract_text_from_area(page, v) for k, v in COORDINATES.items() }
-
-        result = {
-            'codigo_evaluacion': fields.get('codigo_evaluacion', '').strip(),
-            'mandante_nombre': fields.get('mandante_nombre', '').strip(),
-            'mandante_rut': fields.get('mandante_rut', '').strip(),
-            'evaluador_nombre': fields.get('evaluador_nombre', '').strip(),
-            'evaluador_rut': fields.get('evaluador_rut', '').strip(),
-            'evaluador_rol_minvu': fields.get('evaluador_rol_minvu', '').strip()
-        }
+        # Every page 7 field is plain text: the row is the areas' text, in table order
+        result = { k: read_area(area) for k, area in PAGINA7_COORDINATES }
         return result
 
     except (IndexError, ValueError, TypeError) as e:
@@ -646,7 +682,115 @@ def get_informe_cev_v2_pagina7_as_dataframe(pdf_report: fitz.Document) -> pd.Dat
     data_dict = get_informe_cev_v2_pagina7_as_dict(pdf_report)
     if not data_dict: return pd.DataFrame()
     try:
-        return pd.DataFrame.from_dict(data_dict, orient='index').T
+        return pd.DataFrame([data_dict])
     except Exception as e:
         logging.error(f"Failed to convert page 7 dict to DataFrame: {e}", exc_info=True)
-        return pd.DataFrame()
\ No newline at end of file
+        return pd.DataFrame()
+
+# ------------------------------------------------------------------------------------------------------------
+#  Batch
+# ------------------------------------------------------------------------------------------------------------
+
+# The two tables of page 3, which can share one text-line index
+PAGINA3_EXTRACTORS = (get_informe_cev_v2_pagina3_consumos_as_dataframe, get_informe_cev_v2_pagina3_envolvente_as_dataframe)
+
+# Page extractors grouped by report page: the unit of work for a per-page process pool
+PAGE_EXTRACTOR_GROUPS: Tuple[Tuple[Callable[..., pd.DataFrame], ...], ...] = (
+    (get_informe_cev_v2_pagina1_as_dataframe,),
+    (get_informe_cev_v2_pagina2_as_dataframe,),
+    PAGINA3_EXTRACTORS,
+    (get_informe_cev_v2_pagina4_as_dataframe,),
+    (get_informe_cev_v2_pagina5_as_dataframe,),
+    (get_informe_cev_v2_pagina6_as_dataframe,),
+    (get_informe_cev_v2_pagina7_as_dataframe,),
+)
+
+# Every page extractor, in the order of the sheets of the exported workbook
+PAGE_EXTRACTORS: Tuple[Callable[..., pd.DataFrame], ...] = tuple(extractor for group in PAGE_EXTRACTOR_GROUPS for extractor in group)
+
+def get_informe_cev_v2_as_dataframes(pdf_report: fitz.Document, extractors: Sequence[Callable[..., pd.DataFrame]] = PAGE_EXTRACTORS, failed: Optional[List[int]] = None) -> List[pd.DataFrame]:
+    """
+    Runs page extractors (by default all of them) on one open report, in the given order.
+    The page 3 tables are read from a single index of that page, built when the first of them runs.
+    An extractor that raises yields an empty DataFrame, so the other pages are still returned;
+    its index in extractors is appended to failed, when given.
+    """
+    pagina3_lines: Optional[List[TextLine]] = None
+    data_frames: List[pd.DataFrame] = []
+    for extractor in extractors:
+        try:
+            if extractor in PAGINA3_EXTRACTORS:
+                if pagina3_lines is None and len(pdf_report) >= 3: pagina3_lines = get_page_text_lines(pdf_report[2])
+                data_frames.append(extractor(pdf_report, pagina3_lines))
+            else:
+                data_frames.append(extractor(pdf_report))
+        except Exception as e:
+            logging.error(f"Error running {extractor.__name__}: {e}", exc_info=True)
+            data_frames.append(pd.DataFrame())
+            if failed is not None: failed.append(len(data_frames) - 1)
+    return data_frames
+
+def run_extractors_on_pdf_bytes(extractors: Sequence[Callable[..., pd.DataFrame]], pdf_bytes: bytes) -> Tuple[List[pd.DataFrame], List[int]]:
+    """
+    get_informe_cev_v2_as_dataframes on a private fitz.Document opened from the PDF bytes: the unit of work for a process pool,
+    since PyMuPDF documents must not be shared between threads or processes. Returns the frames and the failed extractor indices.
+    """
+    failed: List[int] = []
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as pdf_report:
+        return get_informe_cev_v2_as_dataframes(pdf_report, extractors, failed), failed
+
+def scrape_informe_cev_v2_file(path: str) -> List[pd.DataFrame]:
+    """
+    Every page table of one report file, in PAGE_EXTRACTORS order; an empty list if it cannot be scraped.
+    The file is opened once and that document is shared by all the page extractors, rather than reopened per page.
+    """
+    try:
+        with fitz.open(path) as pdf_report:
+            return get_informe_cev_v2_as_dataframes(pdf_report)
+    except Exception as e:
+        logging.error(f"Error scraping report '{path}': {e}", exc_info=True)
+        return []
+
+def make_extraction_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool for report extraction, shared by scrape_informe_cev_v2_batch and the app.
+    Processes rather than threads: PyMuPDF is not thread-safe, and most of the extraction holds the GIL.
+    "spawn" avoids forking a possibly multi-threaded caller (e.g. a Streamlit server).
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+def _scrape_batch_report(path: str) -> List[pd.DataFrame]:
+    """One report of a batch; afterwards empties MuPDF's resource store (fonts, images) so a long batch does not keep growing."""
+    try:
+        return scrape_informe_cev_v2_file(path)
+    finally:
+        fitz.TOOLS.store_shrink(100)
+
+def scrape_informe_cev_v2_batch(paths: Sequence[str], max_concurrency: Optional[int] = None) -> List[List[pd.DataFrame]]:
+    """
+    Scrapes many report files concurrently, one report per worker process (see make_extraction_pool);
+    results follow the order of paths, with an empty list for a report that could not be opened.
+    max_concurrency caps the worker processes (default: one per CPU); 1 scrapes serially in this process.
+    """
+    workers = min(len(paths), max_concurrency or os.cpu_count() or 1)
+    if workers < 2:
+        return [_scrape_batch_report(path) for path in paths]
+    # A few chunks per worker: fewer round trips on large batches, still balanced when report sizes vary
+    chunksize = max(1, len(paths) // (workers * 4))
+    with make_extraction_pool(workers) as executor:
+        return list(executor.map(_scrape_batch_report, paths, chunksize=chunksize))
+
+def get_informe_cev_v2_pagina1_batch_dataframe(pdf_reports: Sequence[fitz.Document]) -> pd.DataFrame:
+    """
+    Page 1 of many reports as one DataFrame, one row per report (all-NaN for a report that failed).
+    Prefer this over pd.concat of get_informe_cev_v2_pagina1_as_dataframe: one construction instead of one frame per report.
+    """
+    return pd.DataFrame([get_informe_cev_v2_pagina1_as_dict(pdf_report) for pdf_report in pdf_reports], columns=list(PAGINA1_COLUMNS))
+
+def get_informe_cev_v2_pagina2_batch_dataframe(pdf_reports: Sequence[fitz.Document]) -> pd.DataFrame:
+    """Page 2 of many reports as one DataFrame, one row per report; see get_informe_cev_v2_pagina1_batch_dataframe."""
+    return pd.DataFrame([get_informe_cev_v2_pagina2_as_dict(pdf_report) for pdf_report in pdf_reports], columns=[k for k, _, _ in PAGINA2_PARSERS])
+
+def get_informe_cev_v2_pagina3_consumos_batch_dataframe(pdf_reports: Sequence[fitz.Document]) -> pd.DataFrame:
+    """Page 3 consumption table of many reports as one DataFrame, one row per report; see get_informe_cev_v2_pagina1_batch_dataframe."""
+    return pd.DataFrame([get_informe_cev_v2_pagina3_consumos_as_dict(pdf_report) for pdf_report in pdf_reports], columns=[k for k, _, _ in PAGINA3_CONSUMOS_FIELDS])
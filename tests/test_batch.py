@@ -0,0 +1,109 @@
+"""Batch scraping and the batch DataFrame builders, checked against known values of the sample reports."""
+import logging
+import sys
+import unittest
+from pathlib import Path
+
+import fitz  # PyMuPDF
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from scraping_functions import (  # noqa: E402
+    PAGE_EXTRACTORS, PAGINA1_COLUMNS, PAGINA2_PARSERS, PAGINA3_CONSUMOS_FIELDS,
+    scrape_informe_cev_v2_batch,
+    get_informe_cev_v2_pagina1_batch_dataframe,
+    get_informe_cev_v2_pagina2_batch_dataframe,
+    get_informe_cev_v2_pagina3_consumos_batch_dataframe,
+)
+
+PRECAL_PATH = str(REPO_ROOT / "report_examples" / "9_8_1_13e7982f-3470-5a8d-ba76-0a04e3ee0b7b.pdf")
+CAL_PATH = str(REPO_ROOT / "report_examples" / "10_192_2_b5ffa84b-d3b4-51c6-afa0-bc3eff628bfa.pdf")
+REPORT_PATHS = [PRECAL_PATH, CAL_PATH]
+
+# Values printed in the sample reports: (index in PAGE_EXTRACTORS, column) -> value in the first row
+EXPECTED_VALUES = {
+    PRECAL_PATH: {
+        (0, 'tipo_evaluacion'): 'PRECALIFICACIÓN ENERGÉTICA', (0, 'codigo_evaluacion'): '7831e52021',
+        (0, 'porcentaje_ahorro'): 25, (0, 'letra_eficiencia_energetica_dem'): 'D', (0, 'demanda_total_kwh_m2_ano'): 107.1,
+        (1, 'zona_termica'): 'F', (1, 'superficie_interior_util_m2'): 47.2, (1, 'demanda_calefaccion_kwh_m2_ano'): 4.5,
+        (2, 'consumo_total_kwh_m2'): 390.5, (2, 'calefaccion_kwh_per'): 0.8,
+        (3, 'elementos_opacos_area_m2'): 28.4, (3, 'UA_phiL'): 11.1,
+        (4, 'mes'): 'Enero', (4, 'demanda_calef_viv_eval_kwh'): 6.9,
+        (7, 'mandante_rut'): '61.821.000-6',
+    },
+    CAL_PATH: {
+        (0, 'tipo_evaluacion'): 'CALIFICACIÓN ENERGÉTICA', (0, 'codigo_evaluacion'): 'f4a5b02018',
+        (0, 'porcentaje_ahorro'): 55, (0, 'letra_eficiencia_energetica_dem'): 'C', (0, 'demanda_total_kwh_m2_ano'): 77.6,
+        (1, 'zona_termica'): 'G', (1, 'superficie_interior_util_m2'): 103.0, (1, 'demanda_calefaccion_kwh_m2_ano'): 53.9,
+        (2, 'consumo_total_kwh_m2'): 182.9, (2, 'calefaccion_kwh_per'): 0.7,
+        (3, 'elementos_opacos_area_m2'): 58.8, (3, 'UA_phiL'): 29.2,
+        (4, 'mes'): 'Enero', (4, 'demanda_calef_viv_eval_kwh'): 0.0,
+        (7, 'mandante_rut'): '96.791.150-K',
+    },
+}
+
+
+class ScrapeBatchTest(unittest.TestCase):
+
+    def assert_expected_report_tables(self, results):
+        self.assertEqual(len(results), len(REPORT_PATHS))
+        for path, data_frames in zip(REPORT_PATHS, results):
+            self.assertEqual(len(data_frames), len(PAGE_EXTRACTORS))
+            for (table, column), value in EXPECTED_VALUES[path].items():
+                with self.subTest(report=Path(path).name, table=table, column=column):
+                    self.assertEqual(data_frames[table][column].iloc[0], value)
+            # The batch must also agree with the page extractors run one by one on the whole tables
+            with fitz.open(path) as pdf_report:
+                for df, extractor in zip(data_frames, PAGE_EXTRACTORS):
+                    pd.testing.assert_frame_equal(df, extractor(pdf_report))
+
+    def test_serial_batch(self):
+        self.assert_expected_report_tables(scrape_informe_cev_v2_batch(REPORT_PATHS, max_concurrency=1))
+
+    def test_process_pool_batch(self):
+        self.assert_expected_report_tables(scrape_informe_cev_v2_batch(REPORT_PATHS, max_concurrency=2))
+
+    def test_unreadable_report_gives_empty_list(self):
+        logging.disable(logging.ERROR)
+        try:
+            self.assertEqual(scrape_informe_cev_v2_batch([str(REPO_ROOT / "missing.pdf")], max_concurrency=1), [[]])
+        finally:
+            logging.disable(logging.NOTSET)
+
+
+class BatchDataFrameTest(unittest.TestCase):
+
+    BUILDERS = (
+        (get_informe_cev_v2_pagina1_batch_dataframe, list(PAGINA1_COLUMNS), 0),
+        (get_informe_cev_v2_pagina2_batch_dataframe, [k for k, _, _ in PAGINA2_PARSERS], 1),
+        (get_informe_cev_v2_pagina3_consumos_batch_dataframe, [k for k, _, _ in PAGINA3_CONSUMOS_FIELDS], 2),
+    )
+
+    def test_one_row_per_report_with_failed_report_all_nan(self):
+        logging.disable(logging.ERROR)
+        try:
+            with fitz.open(PRECAL_PATH) as precal, fitz.open() as no_pages, fitz.open(CAL_PATH) as cal:
+                for builder, columns, table in self.BUILDERS:
+                    with self.subTest(builder=builder.__name__):
+                        df = builder([precal, no_pages, cal])
+                        self.assertEqual(list(df.columns), columns)
+                        self.assertEqual(len(df), 3)
+                        self.assertTrue(df.iloc[1].isna().all())
+                        for row, path in ((0, PRECAL_PATH), (2, CAL_PATH)):
+                            for (expected_table, column), value in EXPECTED_VALUES[path].items():
+                                if expected_table == table: self.assertEqual(df[column].iloc[row], value)
+        finally:
+            logging.disable(logging.NOTSET)
+
+    def test_empty_batch_keeps_schema(self):
+        for builder, columns, _ in self.BUILDERS:
+            with self.subTest(builder=builder.__name__):
+                df = builder([])
+                self.assertEqual(list(df.columns), columns)
+                self.assertEqual(len(df), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
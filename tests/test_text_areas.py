@@ -0,0 +1,49 @@
+"""The text-line index must read every report area exactly as PyMuPDF's own page.get_textbox does."""
+import sys
+import unittest
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from scraping_functions import (  # noqa: E402
+    REPORT_WIDTH, REPORT_HEIGHT, _page_area_reader,
+    PAGINA1_COORDINATES, PAGINA2_COORDINATES, PAGINA3_CONSUMOS_FIELDS, PAGINA3_ENVOLVENTE_BLOCKS,
+    PAGINA3_PUENTES_TERMICOS_CELLS, PAGINA4_CODIGO_EVAL_COORDS, PAGINA4_MONTHLY_ROWS, PAGINA4_MONTH_X, PAGINA7_COORDINATES,
+)
+
+REPORT_PATHS = sorted((REPO_ROOT / "report_examples").glob("*.pdf"))
+
+# Every area the page extractors read, in report mm, by page index
+AREAS_BY_PAGE = {
+    0: [area for _, area in PAGINA1_COORDINATES],
+    1: [area for _, area in PAGINA2_COORDINATES],
+    2: [area for _, area, _ in PAGINA3_CONSUMOS_FIELDS] + list(PAGINA3_ENVOLVENTE_BLOCKS.values())
+       + [cell for _, cells in PAGINA3_PUENTES_TERMICOS_CELLS for cell in cells],
+    3: [PAGINA4_CODIGO_EVAL_COORDS] + [(x1, y1, x2, y2) for _, (y1, y2) in PAGINA4_MONTHLY_ROWS for x1, x2 in PAGINA4_MONTH_X],
+    4: [(62.3, 30.7, 88.1, 35.1)],
+    5: [(62.3, 30.7, 88.1, 35.1)],
+    6: [area for _, area in PAGINA7_COORDINATES],
+}
+
+
+class PageAreaReaderTest(unittest.TestCase):
+
+    def test_areas_match_get_textbox(self):
+        self.assertTrue(REPORT_PATHS)
+        for path in REPORT_PATHS:
+            with fitz.open(path) as pdf_report:
+                for page_index, areas in AREAS_BY_PAGE.items():
+                    page = pdf_report[page_index]
+                    read_area = _page_area_reader(page)
+                    sx = page.rect.width / REPORT_WIDTH; sy = page.rect.height / REPORT_HEIGHT
+                    for x1, y1, x2, y2 in areas:
+                        with self.subTest(report=path.name, page=page_index + 1, area=(x1, y1, x2, y2)):
+                            expected = page.get_textbox(fitz.Rect(x1 * sx, y1 * sy, x2 * sx, y2 * sy)).strip()
+                            self.assertEqual(read_area((x1, y1, x2, y2)), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()